@@ -0,0 +1,366 @@
+"""Benchmarks of the data pipeline on synthetic data.
+
+Every stage runs in a fresh process, so caches and memory peaks do not carry over
+between cases. The wall time (best of ``--repeat`` runs) and the growth of the peak
+resident memory are compared with ``baselines.json``, and the run fails if a case got
+slower or bigger than the tolerance allows.
+
+Usage::
+
+    python -m benchmarks.run                  # small sizes, compare with baselines
+    python -m benchmarks.run --size large     # up to 50 years and 10k sites
+    python -m benchmarks.run --save           # store the results as new baselines
+    python -m benchmarks.run --stage join_data --stage read_weather_data
+
+Baselines depend on the machine, so store them on the machine that compares them.
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from src.cache import CACHE_DIR, cache_path
+
+from . import synthetic
+
+DATA_DIR = CACHE_DIR / "benchmarks"
+BASELINES = Path(__file__).parent / "baselines.json"
+
+SIZES = {
+    "small": {"years": (1,), "sites": (1, 100)},
+    "medium": {"years": (1, 10), "sites": (1, 100, 1000)},
+    "large": {"years": (1, 10, 50), "sites": (1, 100, 1000, 10000)},
+}
+"""Dataset sizes per preset, in years of hourly data and number of sites."""
+
+MIN_SECONDS = 0.05
+MIN_MEMORY_MB = 16.0
+"""Differences below these are noise, whatever the tolerance."""
+
+
+def _weather_file(years: int) -> Path:
+    path = DATA_DIR / f"weather-{years}y.csv"
+    return path if path.exists() else synthetic.weather_csv(path, years)
+
+
+def _price_file(years: int) -> Path:
+    path = DATA_DIR / f"price-{years}y.csv"
+    return path if path.exists() else synthetic.price_csv(path, years)
+
+
+def _grid_file(sites: int) -> Path:
+    path = DATA_DIR / f"grid-{sites}.csv"
+    return path if path.exists() else synthetic.climate_grid_csv(path, sites)
+
+
+def _farms_file(sites: int) -> Path:
+    path = DATA_DIR / f"farms-{sites}.json"
+    return path if path.exists() else synthetic.farms_geojson(path, sites)
+
+
+# Each stage prepares its inputs for a size and returns the function to time, which
+# returns the number of rows it produced.
+
+
+def _read_weather_data_cold(years: int):
+    from src.weather import SCHEMA, read_weather_data
+
+    path = _weather_file(years)
+
+    def run():
+        cache_path(path, SCHEMA).unlink(missing_ok=True)
+        return len(read_weather_data(path, columns=("wind_speed", "rain")).collect())
+
+    return run
+
+
+def _read_weather_data(years: int):
+    from src.weather import read_weather_data
+
+    path = _weather_file(years)
+    read_weather_data(path).collect()
+    return lambda: len(
+        read_weather_data(path, columns=("wind_speed", "rain")).collect()
+    )
+
+
+def _read_price_data(years: int):
+    from src.market import read_price_data
+
+    path = _price_file(years)
+    read_price_data(path, end=None).collect()
+    return lambda: len(read_price_data(path, end=None).collect())
+
+
+def _join_data(years: int):
+    from src.data_aggregation import join_data
+    from src.market import read_price_data
+    from src.turbines import TURBINES
+    from src.weather import read_weather_data
+
+    weather_data = read_weather_data(_weather_file(years))
+    price_data = read_price_data(_price_file(years), end=None)
+    weather_data.collect(), price_data.collect()
+    return lambda: len(
+        join_data(weather_data, price_data, TURBINES["IEA 15 240"]).collect()
+    )
+
+
+def _revenue(years: int):
+    from src.market import read_price_data
+    from src.revenue import revenue, total_revenue
+    from src.turbines import TURBINES
+    from src.weather import read_weather_data
+
+    weather_data = read_weather_data(
+        _weather_file(years), columns=("wind_speed", "rain")
+    )
+    price_data = read_price_data(_price_file(years), end=None)
+    weather_data.collect(), price_data.collect()
+    caps = np.linspace(60, 100, 20)
+    return lambda: len(
+        total_revenue(
+            revenue(
+                weather_data, price_data, {"IEA 15 240": TURBINES["IEA 15 240"]}, caps
+            )
+        ).collect()
+    )
+
+
+def _power_curve(years: int):
+    from src.power_curve import PowerCurve
+    from src.turbines import TURBINES
+
+    wind_speed = np.random.default_rng(0).weibull(2, years * 8760) * 9.5
+
+    def run():
+        curve = PowerCurve.from_turbine(TURBINES["IEA 15 240"])
+        curve.get_power(wind_speed), curve.get_rotor_speed(wind_speed)
+        return len(wind_speed)
+
+    return run
+
+
+def _calculate_impingement(years: int):
+    from src.impingement import WINDFARM_FILES, calculate_impingement
+    from src.turbines import TURBINES
+    from src.weather import read_weather_data
+
+    WINDFARM_FILES["benchmark"] = path = _weather_file(years)
+    read_weather_data(path).collect()
+    return lambda: len(
+        calculate_impingement(TURBINES["IEA 15 240"], "benchmark", 80)[0]
+    )
+
+
+def _compact_impingement(years: int):
+    from src.impingement import WINDFARM_FILES, compact_impingement
+    from src.turbines import TURBINES
+    from src.weather import read_weather_data
+
+    WINDFARM_FILES["benchmark"] = path = _weather_file(years)
+    read_weather_data(path).collect()
+    return lambda: len(
+        compact_impingement(TURBINES["IEA 15 240"], "benchmark", 80).timestamp
+    )
+
+
+def _stream_impingement(years: int):
+    import shutil
+
+    from src.streaming import stream_impingement
+    from src.weather import read_weather_data
+
+    path = _weather_file(years)
+    output = DATA_DIR / "stream"
+    hours = len(read_weather_data(path).collect())
+    caps = np.linspace(60, 100, 20)
+
+    def run():
+        shutil.rmtree(output, ignore_errors=True)
+        stream_impingement({"benchmark": path}, output, "IEA 15 240", caps)
+        return hours * len(caps)
+
+    return run
+
+
+def _energy_yield(years: int):
+    from src.energy_yield import energy_yield
+    from src.turbines import TURBINES
+    from src.weather import read_weather_data
+
+    data = read_weather_data(
+        _weather_file(years), columns=("wind_speed", "rain")
+    ).collect()
+    wind_speed, rain = data["wind_speed"].to_numpy(), data["rain"].to_numpy()
+    caps = np.linspace(60, 100, 20)
+
+    def run():
+        energy_yield(TURBINES["IEA 15 240"], wind_speed, rain, caps)
+        return len(wind_speed) * len(caps)
+
+    return run
+
+
+def _grid_impingement(sites: int):
+    from src.grid import grid_impingement, read_climate_grid
+
+    path = _grid_file(sites)
+    read_climate_grid(path).collect()
+    return lambda: len(grid_impingement(read_climate_grid(path)).collect())
+
+
+def _farm_cells(sites: int):
+    from src.geometry import WindfarmGeometries
+    from src.grid import read_climate_grid
+    from src.spatial_join import farm_cells
+
+    # A grid needs neighbouring points to have cells, so few farms use the 100 site grid.
+    grid = read_climate_grid(_grid_file(max(sites, 100)))
+    geometries = WindfarmGeometries([_farms_file(sites)])
+    grid.collect()
+    return lambda: len(farm_cells(grid, geometries))
+
+
+def _generate_map(sites: int):
+    from src.geometry import WindfarmGeometries
+    from src.map import generate_map
+
+    geometries = WindfarmGeometries([_farms_file(sites)])
+    windfarms = list(geometries.data["name"])
+
+    def run():
+        generate_map(windfarms, geometries=geometries).get_root().render()
+        return len(windfarms)
+
+    return run
+
+
+STAGES: dict[str, tuple[str, Callable]] = {
+    "read_weather_data_cold": ("years", _read_weather_data_cold),
+    "read_weather_data": ("years", _read_weather_data),
+    "read_price_data": ("years", _read_price_data),
+    "join_data": ("years", _join_data),
+    "revenue": ("years", _revenue),
+    "power_curve": ("years", _power_curve),
+    "calculate_impingement": ("years", _calculate_impingement),
+    "compact_impingement": ("years", _compact_impingement),
+    "stream_impingement": ("years", _stream_impingement),
+    "energy_yield": ("years", _energy_yield),
+    "grid_impingement": ("sites", _grid_impingement),
+    "farm_cells": ("sites", _farm_cells),
+    "generate_map": ("sites", _generate_map),
+}
+"""Benchmarked stages and the size dimension they scale with."""
+
+
+def _peak_memory_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(stage: str, size: int, repeat: int) -> dict:
+    run = STAGES[stage][1](size)
+    before = _peak_memory_mb()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = run()
+        seconds.append(time.perf_counter() - start)
+    return {
+        "seconds": min(seconds),
+        "memory_mb": _peak_memory_mb() - before,
+        "rows": rows,
+    }
+
+
+def measure(stage: str, size: int, repeat: int = 3) -> dict:
+    """Time a stage in a fresh process.
+
+    Args:
+        stage (str): Stage to run, see ``STAGES``.
+        size (int): Years of hourly data or number of sites, see ``STAGES``.
+        repeat (int): Number of timed runs, the fastest counts.
+
+    Returns:
+        dict: ``seconds``, ``memory_mb`` (growth of the peak resident memory while
+        running) and ``rows`` (rows produced).
+    """
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_measure, (stage, size, repeat))
+
+
+def compare(
+    results: dict[str, dict], baselines: dict[str, dict], tolerance: float
+) -> list[str]:
+    """Describe the cases that are slower or use more memory than their baseline.
+
+    Args:
+        results (dict[str, dict]): Results by case, see ``measure``.
+        baselines (dict[str, dict]): Stored results by case.
+        tolerance (float): Allowed relative increase, e.g. 0.25 for 25 %.
+
+    Returns:
+        list[str]: One message per regression.
+    """
+    regressions = []
+    for case, result in results.items():
+        if case not in baselines:
+            continue
+        for metric, noise in (("seconds", MIN_SECONDS), ("memory_mb", MIN_MEMORY_MB)):
+            baseline, value = baselines[case][metric], result[metric]
+            if value > baseline * (1 + tolerance) and value - baseline > noise:
+                regressions.append(
+                    f"{case}: {metric} {value:.3f} > baseline {baseline:.3f}"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="small")
+    parser.add_argument("--stage", action="append", choices=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="store as baselines")
+    args = parser.parse_args(argv)
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    baselines = (
+        json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    )
+    results = {}
+    print(f"{'case':<36}{'seconds':>10}{'memory MB':>12}{'rows':>12}{'baseline':>10}")
+    for stage in args.stage or STAGES:
+        dimension, _ = STAGES[stage]
+        for size in SIZES[args.size][dimension]:
+            case = f"{stage}[{size} {dimension}]"
+            results[case] = result = measure(stage, size, args.repeat)
+            baseline = baselines.get(case, {}).get("seconds")
+            print(
+                f"{case:<36}{result['seconds']:>10.3f}{result['memory_mb']:>12.1f}"
+                f"{result['rows']:>12}"
+                f"{'-' if baseline is None else f'{baseline:.3f}':>10}"
+            )
+
+    if args.save:
+        args.baselines.write_text(json.dumps(baselines | results, indent=2) + "\n")
+        print(f"Saved {len(results)} baselines to {args.baselines}")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from src import grid, market, weather
+
+START = datetime(2000, 1, 1)
+
+
+def _hours(years: int) -> pl.Series:
+    return pl.datetime_range(
+        START,
+        START.replace(year=START.year + years),
+        "1h",
+        closed="left",
+        time_unit="ms",
+        eager=True,
+    )
+
+
+def weather_csv(path: Path, years: int, seed: int = 0) -> Path:
+    """Write hourly weather data in the format of ``src.weather.SCHEMA``.
+
+    Wind speeds follow a Weibull distribution and it rains one hour in ten.
+    """
+    rng = np.random.default_rng(seed)
+    time = _hours(years)
+    n = len(time)
+    columns = {"timestamp": time, "rainc": np.zeros(n)}
+    for height, scale in ((120.0, 9.0), (150.0, 9.5)):
+        columns[f"qrain_{height}"] = np.where(
+            rng.random(n) < 0.1, rng.exponential(2e-4, n), 0.0
+        )
+        columns[f"rho_{height}"] = rng.normal(1.22, 0.02, n)
+        columns[f"wsp_{height}"] = rng.weibull(2, n) * scale
+    pl.DataFrame(columns).select(list(weather.SCHEMA)).write_csv(
+        path, datetime_format="%Y-%m-%d %H:%M:%S"
+    )
+    return path
+
+
+def price_csv(path: Path, years: int, seed: int = 0) -> Path:
+    """Write hourly prices in the format of ``src.market.SCHEMA``."""
+    rng = np.random.default_rng(seed)
+    time = _hours(years)
+    pl.DataFrame(
+        {
+            "Country": "Denmark",
+            "ISO3 Code": "DNK",
+            "Datetime (UTC)": time,
+            "Datetime (Local)": time,
+            "Price (EUR/MWhe)": np.round(rng.lognormal(3.5, 0.5, len(time)), 2),
+        }
+    ).select(list(market.SCHEMA)).write_csv(path, datetime_format="%Y-%m-%d %H:%M:%S")
+    return path
+
+
+def climate_grid_csv(path: Path, sites: int, seed: int = 0) -> Path:
+    """Write a square grid of about ``sites`` locations over the North and Baltic Sea
+    in the format of ``src.grid.SCHEMA``."""
+    rng = np.random.default_rng(seed)
+    side = max(int(np.ceil(np.sqrt(sites))), 1)
+    xlat, xlong = np.meshgrid(np.linspace(53, 60, side), np.linspace(3, 22, side))
+    xlat, xlong = xlat.ravel()[:sites], xlong.ravel()[:sites]
+    pl.DataFrame(
+        {
+            "xlat": xlat,
+            "xlong": xlong,
+            "qrain_avg_150.0": rng.exponential(2e-5, len(xlat)),
+            "rainc_avg": np.zeros(len(xlat)),
+            "rho_avg_150.0": rng.normal(1.22, 0.02, len(xlat)),
+            "wsp_avg_150.0": rng.normal(9.5, 1, len(xlat)),
+        }
+    ).select(list(grid.SCHEMA)).write_csv(path)
+    return path
+
+
+def farms_geojson(path: Path, sites: int, size: float = 0.1, seed: int = 0) -> Path:
+    """Write ``sites`` square wind farms of ``size`` degrees within the climate grid."""
+    rng = np.random.default_rng(seed)
+    west = rng.uniform(3, 22 - size, sites)
+    south = rng.uniform(53, 60 - size, sites)
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"name": f"Farm {i}"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+                ],
+            },
+        }
+        for i, (x, y) in enumerate(zip(west.tolist(), south.tolist()))
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return path
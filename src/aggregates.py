@@ -0,0 +1,112 @@
+import os
+from datetime import datetime, timedelta
+from typing import Sequence
+
+import polars as pl
+
+from .cache import CACHE_DIR
+from .instrumentation import count_cache
+
+ROLLUP_DIR = CACHE_DIR / "rollups"
+
+RESOLUTIONS = {
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+    "1w": timedelta(weeks=1),
+    "1mo": timedelta(days=30.44),
+}
+"""Rollup intervals, finest first, with their approximate length."""
+
+
+def rollup(data: pl.LazyFrame, columns: Sequence[str], every: str) -> pl.LazyFrame:
+    """Aggregate time series to a coarser interval.
+
+    Args:
+        data (pl.LazyFrame): Data sorted by ``time``.
+        columns (Sequence[str]): Columns to aggregate.
+        every (str): Interval, see ``RESOLUTIONS``.
+
+    Returns:
+        pl.LazyFrame: A lazy frame with columns ``time`` (start of the interval) and
+        ``<column>``, ``<column>_min`` and ``<column>_max`` with the mean, minimum and
+        maximum of each column.
+    """
+    return data.group_by_dynamic("time", every=every).agg(
+        [
+            aggregate
+            for column in columns
+            for aggregate in (
+                pl.col(column).mean(),
+                pl.col(column).min().alias(f"{column}_min"),
+                pl.col(column).max().alias(f"{column}_max"),
+            )
+        ]
+    )
+
+
+def select_resolution(start: datetime, end: datetime, max_points: int) -> str:
+    """Finest interval of ``RESOLUTIONS`` with at most ``max_points`` points in a range."""
+    for every, length in RESOLUTIONS.items():
+        if (end - start) / length <= max_points:
+            return every
+    return every
+
+
+class Rollups:
+    """Hourly, daily, weekly and monthly rollups of a dataset, stored on disk.
+
+    Each resolution is computed the first time it is requested and written next to the
+    ingestion cache under ``key``, so later requests, also from other sessions, only
+    read the stored rollup.
+
+    Args:
+        data (pl.LazyFrame): Data sorted by ``time``.
+        columns (Sequence[str]): Columns to aggregate.
+        key (str): Identifies the dataset, e.g. from ``src.cache.source_key``.
+    """
+
+    def __init__(self, data: pl.LazyFrame, columns: Sequence[str], key: str):
+        self.data = data
+        self.columns = list(columns)
+        self.key = key
+
+    def scan(self, every: str) -> pl.LazyFrame:
+        """Rollup at one resolution, see ``rollup``."""
+        path = ROLLUP_DIR / f"{self.key}-{every}.arrow"
+        count_cache(path.exists())
+        if not path.exists():
+            ROLLUP_DIR.mkdir(parents=True, exist_ok=True)
+            partial = path.with_suffix(f".{os.getpid()}.tmp")
+            rollup(self.data, self.columns, every).collect().write_ipc(partial)
+            partial.replace(path)
+        return pl.scan_ipc(path)
+
+    def get(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        max_points: int = 2000,
+        every: str | None = None,
+    ) -> pl.DataFrame:
+        """Rollup of a time range at the finest resolution that fits ``max_points``.
+
+        Args:
+            start (datetime | None): Start of the range, start of the data by default.
+            end (datetime | None): End of the range, end of the data by default.
+            max_points (int): Maximum number of points to return.
+            every (str | None): Resolution to use instead of choosing one.
+        """
+        if every is None:
+            bounds = self.scan("1mo").select(
+                start=pl.col("time").min(), end=pl.col("time").max()
+            )
+            first, last = bounds.collect().row(0)
+            every = select_resolution(
+                start or first, end or last + RESOLUTIONS["1mo"], max_points
+            )
+        data = self.scan(every)
+        if start is not None:
+            data = data.filter(pl.col("time") >= start)
+        if end is not None:
+            data = data.filter(pl.col("time") < end)
+        return data.collect()
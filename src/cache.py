@@ -0,0 +1,71 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Sequence
+
+import polars as pl
+
+from .instrumentation import count_cache
+
+CACHE_DIR = Path(__file__).parents[1] / ".cache"
+
+
+def _digest(*parts: object) -> str:
+    return hashlib.sha1("\0".join(map(str, parts)).encode()).hexdigest()[:16]
+
+
+def source_key(*paths: str | Path, extra: Sequence[object] = ()) -> str:
+    """Key identifying the current version of one or more source files.
+
+    Changes whenever a file is modified, so data derived from the files can be stored
+    under it. ``extra`` adds further parameters the derived data depends on.
+    """
+    parts = []
+    for path in map(Path, paths):
+        stat = path.stat()
+        parts.extend((path.resolve(), stat.st_mtime_ns, stat.st_size))
+    return _digest(*parts, *extra)
+
+
+def cache_path(path: str | Path, schema: dict | None = None) -> Path:
+    """Location of the cached copy of a CSV file.
+
+    The name is derived from the source path, its modification time and size, and the
+    schema it is parsed with, so changing any of them yields a different file.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    source = _digest(path)
+    version = _digest(stat.st_mtime_ns, stat.st_size, sorted((schema or {}).items()))
+    return CACHE_DIR / f"{source}-{version}.arrow"
+
+
+def scan_csv(path: str | Path, schema: dict | None = None) -> pl.LazyFrame:
+    """Lazily scan a CSV file through the columnar ingestion cache.
+
+    On first use the CSV is parsed with ``schema`` and stored as an Arrow IPC file in
+    ``CACHE_DIR``. Later scans memory-map that file instead of parsing the CSV again.
+    Copies of older versions of the source are kept, as frames handed out earlier may
+    still read them; ``clear_cache`` removes them.
+
+    Args:
+        path (str | Path): CSV file.
+        schema (dict | None): Polars schema of the CSV, inferred if not given.
+
+    Returns:
+        pl.LazyFrame: Lazy frame over the cached file.
+    """
+    cached = cache_path(path, schema)
+    count_cache(cached.exists())
+    if not cached.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        partial = cached.with_suffix(f".{os.getpid()}.tmp")
+        pl.scan_csv(path, schema=schema).sink_ipc(partial)
+        partial.replace(cached)
+    return pl.scan_ipc(cached)
+
+
+def clear_cache():
+    """Remove every cached file."""
+    for cached in CACHE_DIR.rglob("*.arrow"):
+        cached.unlink(missing_ok=True)
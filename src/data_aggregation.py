@@ -1,35 +1,34 @@
-from typing import Sequence
-
 import polars as pl
 
-from .power_curve import get_power_at_wind_velocity
+from .instrumentation import instrument
+from .market import hourly_prices
+from .power_curve import power_at_wind_speed
 
 
+@instrument
 def join_data(
     weather_data: pl.LazyFrame,
     price_data: pl.LazyFrame,
-    power_curve: dict[str, Sequence[float]],
+    turbine: dict,
 ) -> pl.LazyFrame:
     """Join price and weather data on time.
 
+    Prices are averaged per hour with ``src.market.hourly_prices`` first, so the hour
+    repeated when daylight saving time ends gives one row, like every other hour.
+
     Args:
         weather_data (pl.LazyFrame): Weather data.
         price_data (pl.LazyFrame): Price data.
-        power_curve (dict[str, Sequence[float]]): Power curve. Expected schema is: ..code-block::
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``. Power is
+            evaluated on the whole ``wind_speed`` column from its power curve.
 
-            {
-                "wind_speed": Sequence[float],
-                "power": Sequence[float],
-                "rotor_speed": Sequence[float]
-            }
+    Smoothed series for plotting are served by ``src.aggregates.Rollups``.
     """
-    combined_data = weather_data.join(price_data, on="time", how="inner")
-    combined_data = combined_data.with_columns(
-        power=pl.col("wind_speed").map_elements(lambda value: get_power_at_wind_velocity(value, power_curve) * 1e-6)
+    combined_data = weather_data.join(
+        hourly_prices(price_data), on="time", how="inner", maintain_order="left"
     )
-    combined_data = combined_data.with_columns(income=pl.col("power") * pl.col("price"))
     combined_data = combined_data.with_columns(
-        income_sma=pl.col("income").rolling_mean(window_size="1mo", by="time"),
-        price_sma=pl.col("price").rolling_mean(window_size="1mo", by="time"),
+        power=power_at_wind_speed(pl.col("wind_speed"), turbine)
     )
+    combined_data = combined_data.with_columns(income=pl.col("power") * pl.col("price"))
     return combined_data
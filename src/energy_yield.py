@@ -0,0 +1,94 @@
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from .impingement import efficiency, erosion_limit, impingement_rate
+from .power_curve import compile_power_curve
+
+
+class YieldSummary(NamedTuple):
+    """Final values of a yield calculation, one per tip speed cap."""
+
+    tip_speed_caps: np.ndarray
+    energy_yield: np.ndarray
+    """Energy yield (MWh) including the efficiency loss from erosion."""
+    energy_yield_no_loss: np.ndarray
+    """Energy yield (MWh) without erosion."""
+    efficiency: np.ndarray
+    """Turbine efficiency (%) at the end of the period."""
+    r_impg_acc_sum: np.ndarray
+    """Accumulated impingement at the end of the period."""
+    r_acc_limit: float
+    revenue: np.ndarray | None = None
+    """Income including the efficiency loss, when prices are given."""
+
+
+def energy_yield(
+    turbine: dict,
+    wind_speed: np.ndarray,
+    rain: np.ndarray,
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+    block_size: int = 24 * 365,
+    price: np.ndarray | None = None,
+) -> YieldSummary:
+    """Calculate the energy yield with and without erosion for many tip speed caps.
+
+    During rain the rotor is slowed down to the cap, which limits both the impingement
+    and the power. Capped power, impingement, efficiency loss and yield are computed
+    together per block of ``block_size`` hours, carrying the running sums from block to
+    block, so memory stays at ``block_size`` x caps regardless of the period length.
+
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        wind_speed (np.ndarray): Hourly wind speed (m/s).
+        rain (np.ndarray): Hourly rain (``qrain``).
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+        block_size (int): Number of hours evaluated at once.
+        price (np.ndarray | None): Hourly price, to also sum up the revenue.
+    """
+    curve = compile_power_curve(turbine)
+    radius = turbine["radius"]
+    tip_speed_caps = np.asarray(tip_speed_caps, dtype=np.float64)
+    omega_max = tip_speed_caps / radius
+    power_max = np.maximum(curve.get_power_at_rotor_speed(omega_max * 30 / np.pi), 0)
+    r_acc_limit = erosion_limit(turbine, coating)
+
+    r_impg_acc_sum = np.zeros_like(tip_speed_caps)
+    yield_loss = np.zeros_like(tip_speed_caps)
+    yield_no_loss = np.zeros_like(tip_speed_caps)
+    lossvector = np.full_like(tip_speed_caps, 100.0)
+    revenue = None if price is None else np.zeros_like(tip_speed_caps)
+    for start in range(0, len(wind_speed), block_size):
+        ws = np.asarray(wind_speed[start : start + block_size], dtype=np.float64)
+        raining = np.asarray(rain[start : start + block_size], dtype=np.float64)
+        omega = (2 * np.pi / 60) * curve.get_rotor_speed(ws)[:, None]
+        power = curve.get_power(ws)[:, None]
+
+        wet = raining[:, None] > 0
+        omega_capped = np.where(wet & (omega > omega_max), omega_max, omega)
+        power_capped = np.where(wet, np.minimum(power, power_max), power)
+        v_max = np.sqrt(ws[:, None] ** 2 + (omega_capped * radius) ** 2)
+        r_impg = impingement_rate(raining[:, None], v_max)
+
+        acc = r_impg.cumsum(axis=0) + r_impg_acc_sum
+        lossvector = efficiency(acc, r_acc_limit)
+        power_eroded = power_capped * lossvector / 100
+        yield_loss += power_eroded.sum(axis=0)
+        if revenue is not None:
+            prices = np.asarray(price[start : start + block_size], dtype=np.float64)
+            revenue += prices @ power_eroded
+        yield_no_loss += power_capped.sum(axis=0)
+        r_impg_acc_sum = acc[-1]
+        lossvector = lossvector[-1]
+
+    return YieldSummary(
+        tip_speed_caps=tip_speed_caps,
+        energy_yield=yield_loss,
+        energy_yield_no_loss=yield_no_loss,
+        efficiency=lossvector,
+        r_impg_acc_sum=r_impg_acc_sum,
+        r_acc_limit=r_acc_limit,
+        revenue=revenue,
+    )
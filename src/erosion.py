@@ -0,0 +1,66 @@
+import functools
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from .cache import scan_csv
+
+EROSION_FILE = Path(__file__).parents[1] / "data" / "erosion" / "wpd_datasets_clean.csv"
+COATINGS = ("3L", "GCG20", "GAG20", "GS")
+
+
+@dataclass(frozen=True, eq=False)
+class CoatingCurve:
+    """Rain erosion test curve of a blade coating.
+
+    Maps the tip speed (m/s) to the accumulated impingement (m) the coating withstands,
+    with the test points sorted by tip speed for direct interpolation.
+    """
+
+    coating: str
+    tip_speed: np.ndarray
+    r_acc: np.ndarray
+
+    def __call__(self, tip_speed: npt.ArrayLike) -> np.ndarray:
+        tip_speed = np.asarray(tip_speed, dtype=np.float64)
+        if np.any((tip_speed < self.tip_speed[0]) | (tip_speed > self.tip_speed[-1])):
+            raise ValueError(
+                f"Tip speed outside the {self.coating} test range "
+                f"{self.tip_speed[0]:.1f}-{self.tip_speed[-1]:.1f} m/s."
+            )
+        return np.interp(tip_speed, self.tip_speed, self.r_acc)
+
+
+@functools.cache
+def read_coating_curves(path: Path = EROSION_FILE) -> dict[str, CoatingCurve]:
+    """Read the erosion test curves of all coatings.
+
+    The CSV holds a pair of ``<coating>_X`` (accumulated impingement) and
+    ``<coating>_Y`` (tip speed) columns per coating. The result is cached, so the file
+    is only parsed once per process.
+    """
+    data = scan_csv(path).collect()
+    curves = {}
+    for coating in COATINGS:
+        points = data.select([f"{coating}_X", f"{coating}_Y"]).drop_nulls().to_numpy()
+        order = np.argsort(points[:, 1], kind="stable")
+        tip_speed, r_acc = points[order, 1], points[order, 0]
+        tip_speed.flags.writeable = False
+        r_acc.flags.writeable = False
+        curves[coating] = CoatingCurve(coating, tip_speed, r_acc)
+    return curves
+
+
+def r_acc_limit(coating: str, tip_speed: npt.ArrayLike) -> np.ndarray:
+    """Accumulated impingement (m) a coating withstands at the given tip speeds (m/s).
+
+    Args:
+        coating (str): Blade coating, see ``COATINGS``.
+        tip_speed (npt.ArrayLike): Tip speeds (m/s), scalar or array.
+
+    Raises:
+        ValueError: If a tip speed is outside the tested range.
+    """
+    return read_coating_curves()[coating](tip_speed)
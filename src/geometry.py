@@ -0,0 +1,110 @@
+import functools
+from pathlib import Path
+from typing import Sequence
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+LOCATION_DATA = Path(__file__).parent.parent / "location"
+LOCATION_FILES = (LOCATION_DATA / "denmark.json", LOCATION_DATA / "latvia.json")
+
+ALIASES = {"nordsen iii vest": "nordsren iii vest"}
+"""Wind farm names used elsewhere in the app that are spelled differently in the data."""
+
+
+def zoom_tolerance(zoom: float, pixels: float = 0.5) -> float:
+    """Simplification tolerance (degrees) below which details are invisible at a zoom.
+
+    Args:
+        zoom (float): Web map zoom level, 0 shows the whole world in 256 pixels.
+        pixels (float): Largest acceptable error in screen pixels.
+    """
+    return pixels * 360 / (256 * 2**zoom)
+
+
+class WindfarmGeometries:
+    """Wind farm polygons, indexed once for fast lookups and map rendering.
+
+    Names are matched case-insensitively, see also ``ALIASES``. Centroids and bounding
+    boxes are precomputed, and simplified geometries are cached per tolerance.
+
+    Args:
+        paths (Sequence[Path]): GeoJSON files with a ``name`` property per wind farm.
+    """
+
+    def __init__(self, paths: Sequence[Path] = LOCATION_FILES):
+        self.data = gpd.GeoDataFrame(
+            pd.concat([gpd.read_file(path) for path in paths], ignore_index=True)
+        )
+        geometry = self.data.geometry.values
+        self.centroids = shapely.get_coordinates(shapely.centroid(geometry))
+        self.bounds = shapely.bounds(geometry)
+        self.sindex = self.data.sindex
+        self._index = {
+            name.lower(): position
+            for position, name in enumerate(self.data["name"])
+            if isinstance(name, str)
+        }
+        self._simplified: dict[float, np.ndarray] = {}
+
+    def index(self, name: str) -> int:
+        """Row of a wind farm by name."""
+        key = ALIASES.get(name.lower(), name.lower())
+        if key not in self._index:
+            raise KeyError(f"Unknown wind farm {name!r}.")
+        return self._index[key]
+
+    def centroid(self, name: str) -> tuple[float, float]:
+        """Centre (latitude, longitude) of a wind farm."""
+        longitude, latitude = self.centroids[self.index(name)]
+        return float(latitude), float(longitude)
+
+    def within(
+        self,
+        min_longitude: float,
+        min_latitude: float,
+        max_longitude: float,
+        max_latitude: float,
+    ) -> list[str]:
+        """Names of the wind farms intersecting a bounding box."""
+        area = shapely.box(min_longitude, min_latitude, max_longitude, max_latitude)
+        positions = self.sindex.query(area, predicate="intersects")
+        names = self.data["name"].iloc[np.sort(positions)]
+        return [name for name in names if isinstance(name, str)]
+
+    def simplified(self, tolerance: float) -> np.ndarray:
+        """All geometries simplified to ``tolerance`` degrees, cached per tolerance."""
+        if tolerance not in self._simplified:
+            self._simplified[tolerance] = shapely.simplify(
+                self.data.geometry.values, tolerance, preserve_topology=True
+            )
+        return self._simplified[tolerance]
+
+    def outlines(
+        self, name: str, zoom: float | None = None, decimals: int = 5
+    ) -> list[list[list[float]]]:
+        """Exterior rings of a wind farm as ``[latitude, longitude]`` lists for folium.
+
+        Args:
+            name (str): Wind farm name.
+            zoom (float | None): Zoom level to simplify for, full resolution if None.
+            decimals (int): Decimals the coordinates are rounded to, 5 is about 1 m.
+        """
+        position = self.index(name)
+        if zoom is None:
+            geometry = self.data.geometry.values[position]
+        else:
+            geometry = self.simplified(zoom_tolerance(zoom))[position]
+        rings = shapely.get_exterior_ring(shapely.get_parts(geometry))
+        return [
+            np.round(shapely.get_coordinates(ring)[:, ::-1], decimals).tolist()
+            for ring in rings
+        ]
+
+
+@functools.cache
+def load_geometries() -> WindfarmGeometries:
+    """The wind farm geometries of ``LOCATION_FILES``, loaded once per process."""
+    return WindfarmGeometries()
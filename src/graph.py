@@ -0,0 +1,81 @@
+from typing import Any, Callable
+
+from .instrumentation import count_cache
+
+
+def _same(a: Any, b: Any) -> bool:
+    try:
+        return bool(a is b or a == b)
+    except ValueError:  # Arrays have no single truth value.
+        return False
+
+
+class Graph:
+    """Cached computations that only rerun what depends on a changed input.
+
+    Inputs are set with ``set``, computations are declared with ``node`` and evaluated
+    lazily with ``get``. Every result is cached until one of the inputs it depends on,
+    directly or indirectly, changes.
+
+    Example: ..code-block::
+
+        graph = Graph()
+        graph.set("turbine", "IEA 15 240")
+        graph.node("turbine_params", lambda turbine: TURBINES[turbine], "turbine")
+        graph.get("turbine_params")
+    """
+
+    def __init__(self):
+        self._nodes: dict[str, tuple[Callable, tuple[str, ...]]] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._values: dict[str, Any] = {}
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def node(self, name: str, function: Callable, *dependencies: str):
+        """Declare a computation.
+
+        Args:
+            name (str): Name of the result.
+            function (Callable): Called with the values of ``dependencies`` as
+                positional arguments.
+            dependencies (str): Names of the inputs and nodes the result depends on.
+        """
+        self._nodes[name] = (function, dependencies)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(name)
+        self._invalidate(name)
+
+    def set(self, name: str, value: Any):
+        """Set an input, invalidating everything that depends on it if it changed."""
+        if name in self._values and _same(self._values[name], value):
+            return
+        self._invalidate(name)
+        self._values[name] = value
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+    def get(self, name: str) -> Any:
+        """Get a value, computing it and the nodes it depends on when not cached."""
+        count_cache(name in self._values)
+        if name in self._values:
+            self.hits += 1
+            return self._values[name]
+        if name not in self._nodes:
+            raise KeyError(f"Input {name!r} is not set.")
+        self.misses += 1
+        function, dependencies = self._nodes[name]
+        value = function(*(self.get(dependency) for dependency in dependencies))
+        self._values[name] = value
+        self._versions[name] = self._versions.get(name, 0) + 1
+        return value
+
+    def version(self, name: str) -> int:
+        """Number of times a value has been set or computed, to detect changes."""
+        return self._versions.get(name, 0)
+
+    def _invalidate(self, name: str):
+        self._values.pop(name, None)
+        for dependent in self._dependents.get(name, ()):
+            if dependent in self._values:
+                self._invalidate(dependent)
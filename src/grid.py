@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from .cache import scan_csv
+from .impingement import POWER_LOSS, erosion_limit, impingement_rate
+from .power_curve import compile_power_curve, power_at_wind_speed
+from .turbines import TURBINES
+
+GRID_FILE = Path(__file__).parents[1] / "Climate_Data" / "query_result_10km2.csv"
+
+SCHEMA = {
+    "xlat": pl.Float64,
+    "xlong": pl.Float64,
+    "qrain_avg_150.0": pl.Float64,
+    "rainc_avg": pl.Float64,
+    "rho_avg_150.0": pl.Float64,
+    "wsp_avg_150.0": pl.Float64,
+}
+
+HOURS_PER_YEAR = 365.25 * 24
+
+
+def read_climate_grid(path: str | Path = GRID_FILE) -> pl.LazyFrame:
+    """Read the long-term climate averages of a grid of locations.
+
+    See ``SCHEMA`` variable for the expected CSV structure.
+
+    Returns:
+        pl.LazyFrame: A lazy frame with columns ``xlat``, ``xlong``, ``wind_speed``
+        and ``rain``.
+    """
+    return scan_csv(path, schema=SCHEMA).select(
+        [
+            pl.col("xlat"),
+            pl.col("xlong"),
+            pl.col("wsp_avg_150.0").alias("wind_speed"),
+            pl.col("qrain_avg_150.0").alias("rain"),
+        ]
+    )
+
+
+def _turbine_impingement(
+    grid: pl.LazyFrame, name: str, turbine: dict, tip_speed_cap: float | None
+) -> pl.LazyFrame:
+    curve = compile_power_curve(turbine)
+    radius = turbine["radius"]
+    r_acc_limit = float(erosion_limit(turbine))
+
+    omega = (2 * np.pi / 60) * curve.rotor_speed_table.expr(pl.col("wind_speed"))
+    if tip_speed_cap is not None:
+        omega = (
+            pl.when(pl.col("rain") > 0)
+            .then(omega.clip(upper_bound=tip_speed_cap / radius))
+            .otherwise(omega)
+        )
+    v_max = (pl.col("wind_speed") ** 2 + (omega * radius) ** 2).sqrt()
+    r_impg = impingement_rate(pl.col("rain"), v_max)
+
+    return (
+        grid.with_columns(
+            turbine=pl.lit(name),
+            power=power_at_wind_speed(pl.col("wind_speed"), turbine),
+            r_impg=r_impg,
+        )
+        .with_columns(r_impg_per_year=pl.col("r_impg") * HOURS_PER_YEAR)
+        .with_columns(
+            lifetime=r_acc_limit / pl.col("r_impg_per_year"),
+            efficiency_loss_per_year=pl.col("r_impg_per_year")
+            / r_acc_limit
+            * POWER_LOSS
+            * 100,
+        )
+        .with_columns(
+            power_loss=pl.col("power") * pl.col("efficiency_loss_per_year") / 100
+        )
+    )
+
+
+def grid_impingement(
+    grid: pl.LazyFrame,
+    turbines: dict[str, dict] = TURBINES,
+    tip_speed_cap: float | None = None,
+) -> pl.LazyFrame:
+    """Evaluate impingement and erosion for every grid cell and turbine.
+
+    Applies the model of ``calculate_impingement`` to the long-term averages of each
+    cell, so rates are those of the mean wind speed and rain.
+
+    Args:
+        grid (pl.LazyFrame): Climate grid, see ``read_climate_grid``.
+        turbines (dict[str, dict]): Turbines to evaluate by name, all by default.
+        tip_speed_cap (float | None): Maximum tip speed (m/s) during rain, uncapped if
+            not given.
+
+    Returns:
+        pl.LazyFrame: One row per cell and turbine with the columns of ``grid`` and
+        ``turbine``, ``power`` (MW), ``r_impg`` (per hour), ``r_impg_per_year``,
+        ``lifetime`` (years until the ``GS`` coating erosion limit),
+        ``efficiency_loss_per_year`` (%) and ``power_loss`` (MW per year).
+    """
+    return pl.concat(
+        [
+            _turbine_impingement(grid, name, turbine, tip_speed_cap)
+            for name, turbine in turbines.items()
+        ]
+    )
@@ -1,13 +1,17 @@
+import hashlib
+import json
 from pathlib import Path
-from typing import Literal
+from typing import Iterable, Iterator, Literal, NamedTuple, Sequence
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import polars as pl
-from scipy.interpolate import interp1d
 
-from src.turbines import TURBINES
+from src import erosion, weather
+from src.cache import scan_csv
+from src.erosion import EROSION_FILE
+from src.instrumentation import instrument, stage
+from src.power_curve import compile_power_curve
 
 _DATA_DIR = Path(__file__).parents[1] / "Climate_Data"
 WINDFARM_FILES = {
@@ -16,77 +20,459 @@ WINDFARM_FILES = {
 }
 
 
-def calculate_impingement(
-    turbine: dict, windfarm: Literal["e2", "nordsen iii vest"], slider
-):
+def _to_pandas(data: pl.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({name: data[name].to_numpy() for name in data.columns})
+
 
-    if windfarm in WINDFARM_FILES:
-        # Read the corresponding CSV file
-        impingement_raw = pd.read_csv(WINDFARM_FILES[windfarm], sep=",", decimal=".")
-    else:
+@instrument
+def _read_climate_data(windfarm: str) -> pd.DataFrame:
+    if windfarm not in WINDFARM_FILES:
         raise FileNotFoundError("Invalid country selected.")
+    return _to_pandas(
+        scan_csv(WINDFARM_FILES[windfarm], schema=weather.SCHEMA).collect()
+    )
+
+
+AIR_DENSITY = 1.225
+"""Density of air (kg/m³)."""
+WATER_DENSITY = 1000.0
+"""Density of water (kg/m³)."""
+POWER_LOSS = 0.02
+"""Fraction of the power lost once the accumulated impingement reaches the limit."""
+
+
+def impingement_rate(rain, v_max):
+    """Impingement (m) per hour of rain (``qrain``) on a blade tip moving at ``v_max``.
+
+    Works on NumPy arrays and Polars expressions alike.
+    """
+    return rain * v_max * 3600 * (AIR_DENSITY / WATER_DENSITY)
+
+
+def efficiency(r_impg_acc_sum, r_acc_limit: float):
+    """Turbine efficiency (%) after the accumulated impingement ``r_impg_acc_sum``.
+
+    Works on NumPy arrays and Polars expressions alike.
+    """
+    return (1 - r_impg_acc_sum / r_acc_limit * POWER_LOSS) * 100
+
+
+def erosion_limit(turbine: dict, coating: str = "GS") -> float:
+    """Accumulated impingement (m) a coating withstands at the turbine's top tip speed."""
+    rotor_speed = turbine["n_max"] * np.pi / 30 * turbine["radius"]
+    return float(erosion.r_acc_limit(coating, rotor_speed))
+
+
+@instrument
+def calculate_impingement(
+    turbine: dict,
+    windfarm: Literal["e2", "nordsen iii vest"],
+    slider,
+    coating: str = "GS",
+) -> tuple[pl.DataFrame, pl.DataFrame, float, pl.Series]:
+    """Calculate the impingement and efficiency loss of a turbine at a wind farm.
+
+    Builds one lazy query on the cached scan of ``read_weather_data``: the rotor speed
+    is interpolated, capped during rain, and the impingement rate and its cumulative
+    sum follow as expressions. The query is collected once with the streaming engine.
 
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        windfarm (str): Wind farm, see ``WINDFARM_FILES``.
+        slider (float): Maximum tip speed (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+
+    Returns:
+        tuple[pl.DataFrame, pl.DataFrame, float, pl.Series]: The hourly data with
+        columns ``time``, ``wind_speed``, ``rain``, ``n_star``, ``omega``,
+        ``omega_capped``, ``v_max``, ``r_impg``, ``r_impg_acc_sum`` and
+        ``lossvector``, the erosion test data, the accumulated impingement limit of
+        the coating, and the turbine efficiency (%) over time.
+    """
+    if windfarm not in WINDFARM_FILES:
+        raise FileNotFoundError("Invalid country selected.")
     # Parameters
-    n_max = turbine["n_max"]  # Rpm
     radius = turbine["radius"]  # m
-    # Load the CSV file for the specified windfarm
-    impingement_raw = pd.read_csv(WINDFARM_FILES[windfarm], sep=",", decimal=".")
-    impingement_raw["timestamp"] = pd.to_datetime(impingement_raw["timestamp"])
-
-    # Interpolate n.star
-    impingement_raw["n_star"] = interp1d(
-        turbine["power_curve"]["wind_speed"],
-        turbine["power_curve"]["rotor_speed"],
-        fill_value="extrapolate",
-    )(impingement_raw["wsp_150.0"])
-
-    # Calculate omega
-    impingement_raw["omega"] = (((2 * np.pi) / 60)) * impingement_raw["n_star"]
-
-    # calculate omega capped
-    omega_max = slider / turbine["radius"]
-    # Create the 'omega_capped' column
-    impingement_raw["omega_capped"] = np.where(
-        (impingement_raw["qrain_150.0"] > 0) & (impingement_raw["omega"] > omega_max),
-        omega_max,
-        impingement_raw["omega"],
+    omega_max = slider / radius
+    r_acc_limit = erosion_limit(turbine, coating)
+
+    wind_speed = pl.col("wind_speed")
+    rain = pl.col("rain")
+    query = (
+        weather.read_weather_data(
+            WINDFARM_FILES[windfarm], columns=("wind_speed", "rain")
+        )
+        .with_columns(wind_speed.cast(pl.Float64), rain.cast(pl.Float64))
+        # Interpolate n.star
+        .with_columns(
+            n_star=compile_power_curve(turbine).rotor_speed_table.expr(wind_speed)
+        )
+        # Calculate omega
+        .with_columns(omega=(2 * np.pi / 60) * pl.col("n_star"))
+        # Cap omega while it rains
+        .with_columns(
+            omega_capped=pl.when((rain > 0) & (pl.col("omega") > omega_max))
+            .then(omega_max)
+            .otherwise(pl.col("omega"))
+        )
+        # Calculate v.max and r.impg
+        .with_columns(
+            v_max=(wind_speed**2 + (pl.col("omega_capped") * radius) ** 2).sqrt()
+        )
+        .with_columns(r_impg=impingement_rate(rain, pl.col("v_max")))
+        # Accumulate r.impg and the turbine efficiency loss over time
+        .with_columns(r_impg_acc_sum=pl.col("r_impg").cum_sum())
+        .with_columns(lossvector=efficiency(pl.col("r_impg_acc_sum"), r_acc_limit))
     )
+    # The whole query runs here, in one streaming pass over the cached data
+    with stage("impingement.collect") as running:
+        impingement_raw = query.collect(engine="streaming")
+        running.rows = len(impingement_raw)
 
-    # Calculate v.max
-    impingement_raw["v_max"] = np.sqrt(
-        impingement_raw["wsp_150.0"] ** 2
-        + (impingement_raw["omega_capped"] * radius) ** 2
+    # Load impingement test data
+    impingement_testdata = scan_csv(EROSION_FILE).collect()
+
+    return (
+        impingement_raw,
+        impingement_testdata,
+        r_acc_limit,
+        impingement_raw["lossvector"],
     )
 
-    # Calculate r.impg
-    impingement_raw["r_impg"] = (
-        impingement_raw["qrain_150.0"]
-        * impingement_raw["v_max"]
-        * 3600
-        * (1.225 / 1000)
+
+class ImpingementSweep(NamedTuple):
+    """Impingement for a range of tip speed caps.
+
+    Every array except ``tip_speed_caps`` has shape ``(time, cap)``.
+    """
+
+    tip_speed_caps: np.ndarray
+    omega_capped: np.ndarray
+    v_max: np.ndarray
+    r_impg: np.ndarray
+    r_impg_acc_sum: np.ndarray
+    lossvector: np.ndarray
+    r_acc_limit: float
+
+
+@instrument
+def evaluate_sweep(
+    turbine: dict,
+    wind_speed: np.ndarray,
+    rain: np.ndarray,
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+) -> ImpingementSweep:
+    """Calculate impingement for many tip speed caps from climate arrays.
+
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        wind_speed (np.ndarray): Hourly wind speed (m/s).
+        rain (np.ndarray): Hourly rain (``qrain``).
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+    """
+    radius = turbine["radius"]
+    tip_speed_caps = np.asarray(tip_speed_caps, dtype=np.float64)
+    omega_max = tip_speed_caps / radius
+    wind_speed = np.asarray(wind_speed, dtype=np.float64)[:, None]
+    rain = np.asarray(rain, dtype=np.float64)[:, None]
+    n_star = compile_power_curve(turbine).get_rotor_speed(wind_speed)
+    omega = (((2 * np.pi) / 60)) * n_star
+
+    omega_capped = np.where((rain > 0) & (omega > omega_max), omega_max, omega)
+    v_max = np.sqrt(wind_speed**2 + (omega_capped * radius) ** 2)
+    r_impg = impingement_rate(rain, v_max)
+    r_impg_acc_sum = r_impg.cumsum(axis=0)
+
+    r_acc_limit = erosion_limit(turbine, coating)
+    lossvector = efficiency(r_impg_acc_sum, r_acc_limit)
+
+    return ImpingementSweep(
+        tip_speed_caps=tip_speed_caps,
+        omega_capped=omega_capped,
+        v_max=v_max,
+        r_impg=r_impg,
+        r_impg_acc_sum=r_impg_acc_sum,
+        lossvector=lossvector,
+        r_acc_limit=float(r_acc_limit),
+    )
+
+
+@instrument
+def sweep_impingement(
+    turbine: dict,
+    windfarm: Literal["e2", "nordsen iii vest"],
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+) -> tuple[pd.DataFrame, ImpingementSweep]:
+    """Calculate impingement for many tip speed caps at once.
+
+    Same model as ``calculate_impingement``, but the climate and erosion data are read
+    once and every cap is evaluated in a single vectorised pass.
+
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        windfarm (str): Wind farm, see ``WINDFARM_FILES``.
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+
+    Returns:
+        tuple[pd.DataFrame, ImpingementSweep]: The climate data with ``n_star`` and
+        ``omega`` columns, and the per-cap results.
+    """
+    climate = _read_climate_data(windfarm)
+    climate["n_star"] = compile_power_curve(turbine).get_rotor_speed(
+        climate["wsp_150.0"]
+    )
+    climate["omega"] = (((2 * np.pi) / 60)) * climate["n_star"]
+    sweep = evaluate_sweep(
+        turbine, climate["wsp_150.0"], climate["qrain_150.0"], tip_speed_caps, coating
     )
+    return climate, sweep
 
-    # Accumulate r.impg
-    impingement_raw["r_impg_acc_sum"] = impingement_raw["r_impg"].cumsum()
 
-    # Load impingement test data and sort
-    impingement_testdata = pd.read_csv(
-        "data/erosion/wpd_datasets_clean.csv", sep=",", decimal=".", header=0
+def iter_climate_data(
+    windfarm: Literal["e2", "nordsen iii vest"], chunk_size: int = 24 * 365
+) -> Iterator[pl.DataFrame]:
+    """Read the wind speed and rain of a wind farm in chunks of ``chunk_size`` rows.
+
+    See ``weather.iter_weather_data``.
+    """
+    if windfarm not in WINDFARM_FILES:
+        raise FileNotFoundError("Invalid country selected.")
+    return weather.iter_weather_data(
+        WINDFARM_FILES[windfarm], chunk_size, columns=("wind_speed", "rain")
     )
-    p = pl.read_csv("data/erosion/wpd_datasets_clean.csv").sort("3L_X")
 
-    coating = "GS"
-    curve = p.select([f"{coating}_X", f"{coating}_Y"]).drop_nulls().to_numpy()
 
-    rotor_speed = n_max * np.pi / 30 * radius
+def _turbine_key(turbine: dict) -> str:
+    return hashlib.sha1(json.dumps(turbine, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ImpingementAccumulator:
+    """Running impingement of a turbine for one or more tip speed caps.
+
+    Weather rows are fed in chunks with ``update`` and only the running state is kept,
+    so appending new data costs time proportional to the new rows. The state can be
+    saved with ``save`` and restored with ``load`` to continue later.
+
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+    """
+
+    def __init__(
+        self, turbine: dict, tip_speed_caps: Sequence[float], coating: str = "GS"
+    ):
+        self.turbine = turbine
+        self.tip_speed_caps = np.atleast_1d(
+            np.asarray(tip_speed_caps, dtype=np.float64)
+        )
+        self.coating = coating
+        self.r_acc_limit = float(erosion_limit(turbine, coating))
+        self.r_impg_acc_sum = np.zeros_like(self.tip_speed_caps)
+        self.rows = 0
+        self.last_timestamp: np.datetime64 | None = None
+
+    @property
+    def erosion_progress(self) -> np.ndarray:
+        """Fraction of the coating's erosion limit reached so far, per cap."""
+        return self.r_impg_acc_sum / self.r_acc_limit
+
+    @property
+    def lossvector(self) -> np.ndarray:
+        """Current turbine efficiency (%), per cap."""
+        return efficiency(self.r_impg_acc_sum, self.r_acc_limit)
+
+    def new_rows(self, timestamp: np.ndarray) -> np.ndarray:
+        """Mask of the rows after the last row already added, see ``update``."""
+        timestamp = np.asarray(timestamp, dtype="datetime64[ms]")
+        if self.last_timestamp is None:
+            return np.ones(len(timestamp), dtype=bool)
+        return timestamp > self.last_timestamp
+
+    def update(
+        self,
+        wind_speed: np.ndarray,
+        rain: np.ndarray,
+        timestamp: np.ndarray | None = None,
+    ) -> ImpingementSweep:
+        """Add hourly weather rows.
+
+        When timestamps are given, rows at or before the last row already added are
+        skipped, so overlapping chunks can be fed safely.
+
+        Args:
+            wind_speed (np.ndarray): Hourly wind speed (m/s).
+            rain (np.ndarray): Hourly rain (``qrain``).
+            timestamp (np.ndarray | None): Time of each row.
+
+        Returns:
+            ImpingementSweep: Results for the new rows, with the cumulative sum and
+            ``lossvector`` continuing from the previous state.
+        """
+        wind_speed = np.asarray(wind_speed)
+        rain = np.asarray(rain)
+        if timestamp is not None:
+            new = self.new_rows(timestamp)
+            timestamp = np.asarray(timestamp, dtype="datetime64[ms]")[new]
+            wind_speed, rain = wind_speed[new], rain[new]
+            if len(timestamp):
+                self.last_timestamp = timestamp[-1]
 
-    # find location on plot
-    r_acc_limit = interp1d(curve[:, 1], curve[:, 0])(rotor_speed)
+        sweep = evaluate_sweep(
+            self.turbine, wind_speed, rain, self.tip_speed_caps, self.coating
+        )
+        # Continue the running sum row by row, so the sums equal those of one pass.
+        r_impg_acc_sum = np.cumsum(
+            np.vstack([self.r_impg_acc_sum, sweep.r_impg]), axis=0
+        )[1:]
+        if len(r_impg_acc_sum):
+            self.r_impg_acc_sum = r_impg_acc_sum[-1]
+        self.rows += len(r_impg_acc_sum)
+        return sweep._replace(
+            r_impg_acc_sum=r_impg_acc_sum,
+            lossvector=efficiency(r_impg_acc_sum, self.r_acc_limit),
+        )
 
-    # Calculate turbine efficiency loss over time
-    power_loss = 0.02  # Assuming slider value is used here
-    lossvector = (
-        1 - impingement_raw["r_impg_acc_sum"] / r_acc_limit * power_loss
-    ) * 100
+    def consume(self, chunks: Iterable[pl.DataFrame]) -> Iterator[ImpingementSweep]:
+        """Add chunks from ``iter_climate_data``, see ``update``."""
+        for chunk in chunks:
+            yield self.update(
+                chunk["wind_speed"].to_numpy(),
+                chunk["rain"].to_numpy(),
+                chunk["time"].to_numpy(),
+            )
 
-    return impingement_raw, impingement_testdata, r_acc_limit, lossvector
+    def save(self, path: str | Path):
+        """Write the running state to a JSON checkpoint."""
+        state = {
+            "turbine": _turbine_key(self.turbine),
+            "tip_speed_caps": self.tip_speed_caps.tolist(),
+            "coating": self.coating,
+            "r_impg_acc_sum": self.r_impg_acc_sum.tolist(),
+            "rows": self.rows,
+            "last_timestamp": (
+                None if self.last_timestamp is None else str(self.last_timestamp)
+            ),
+        }
+        Path(path).write_text(json.dumps(state))
+
+    @classmethod
+    def load(cls, path: str | Path, turbine: dict) -> "ImpingementAccumulator":
+        """Restore an accumulator from a checkpoint written by ``save``.
+
+        Raises:
+            ValueError: If the checkpoint was saved for another turbine.
+        """
+        state = json.loads(Path(path).read_text())
+        if state.get("turbine") != _turbine_key(turbine):
+            raise ValueError(f"{path} holds the state of another turbine.")
+        accumulator = cls(turbine, state["tip_speed_caps"], state["coating"])
+        accumulator.r_impg_acc_sum = np.asarray(state["r_impg_acc_sum"])
+        accumulator.rows = state["rows"]
+        if state["last_timestamp"] is not None:
+            accumulator.last_timestamp = np.datetime64(state["last_timestamp"], "ms")
+        return accumulator
+
+
+class ImpingementResult(NamedTuple):
+    """Compact impingement of a wind farm for one or more tip speed caps.
+
+    All arrays are indexed by ``timestamp``; with a sequence of caps the per-cap arrays
+    have shape ``(time, cap)``. The cumulative impingement is float64, as float32 sums
+    drift over decades of hours, everything else is float32. The intermediates are
+    None unless requested.
+    """
+
+    timestamp: np.ndarray
+    tip_speed_caps: np.ndarray
+    r_impg_acc_sum: np.ndarray
+    lossvector: np.ndarray
+    r_acc_limit: float
+    n_star: np.ndarray | None = None
+    omega: np.ndarray | None = None
+    omega_capped: np.ndarray | None = None
+    v_max: np.ndarray | None = None
+    r_impg: np.ndarray | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays."""
+        return sum(value.nbytes for value in self if isinstance(value, np.ndarray))
+
+
+@instrument
+def compact_impingement(
+    turbine: dict,
+    windfarm: Literal["e2", "nordsen iii vest"],
+    tip_speed_caps: float | Sequence[float],
+    coating: str = "GS",
+    intermediates: bool = False,
+    block_size: int = 24 * 365,
+) -> ImpingementResult:
+    """Calculate impingement like ``calculate_impingement``, keeping only the results.
+
+    Only the timestamp, wind speed and rain columns are read, and the caps are evaluated
+    in blocks of ``block_size`` hours written into preallocated arrays, so neither the
+    widened climate frame nor full-length float64 intermediates are held.
+
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        windfarm (str): Wind farm, see ``WINDFARM_FILES``.
+        tip_speed_caps (float | Sequence[float]): Maximum tip speed or speeds (m/s)
+            during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+        intermediates (bool): Also keep ``n_star``, ``omega``, ``omega_capped``,
+            ``v_max`` and ``r_impg``.
+        block_size (int): Number of hours evaluated at once.
+    """
+    if windfarm not in WINDFARM_FILES:
+        raise FileNotFoundError("Invalid country selected.")
+    climate = (
+        scan_csv(WINDFARM_FILES[windfarm], schema=weather.SCHEMA)
+        .select("timestamp", "wsp_150.0", "qrain_150.0")
+        .collect()
+    )
+    wind_speed = climate["wsp_150.0"].to_numpy()
+    rain = climate["qrain_150.0"].to_numpy()
+    accumulator = ImpingementAccumulator(turbine, tip_speed_caps, coating)
+    shape = (len(climate), len(accumulator.tip_speed_caps))
+
+    r_impg_acc_sum = np.empty(shape, dtype=np.float64)
+    lossvector = np.empty(shape, dtype=np.float32)
+    per_cap = {}
+    if intermediates:
+        per_cap = {
+            name: np.empty(shape, dtype=np.float32)
+            for name in ("omega_capped", "v_max", "r_impg")
+        }
+    for start in range(0, len(climate), block_size):
+        block = slice(start, start + block_size)
+        sweep = accumulator.update(wind_speed[block], rain[block])
+        r_impg_acc_sum[block] = sweep.r_impg_acc_sum
+        lossvector[block] = sweep.lossvector
+        for name, values in per_cap.items():
+            values[block] = getattr(sweep, name)
+
+    if intermediates:
+        n_star = compile_power_curve(turbine).get_rotor_speed(wind_speed)
+        per_cap["n_star"] = n_star.astype(np.float32)
+        per_cap["omega"] = ((2 * np.pi) / 60 * n_star).astype(np.float32)
+    if np.ndim(tip_speed_caps) == 0:
+        r_impg_acc_sum, lossvector = r_impg_acc_sum[:, 0], lossvector[:, 0]
+        per_cap = {
+            name: values[:, 0] if values.ndim == 2 else values
+            for name, values in per_cap.items()
+        }
+
+    return ImpingementResult(
+        timestamp=climate["timestamp"].to_numpy(),
+        tip_speed_caps=accumulator.tip_speed_caps,
+        r_impg_acc_sum=r_impg_acc_sum,
+        lossvector=lossvector,
+        r_acc_limit=accumulator.r_acc_limit,
+        **per_cap,
+    )
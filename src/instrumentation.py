@@ -0,0 +1,198 @@
+import contextlib
+import functools
+import json
+import resource
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple
+
+import polars as pl
+
+_enabled = False
+_records: list["StageRecord"] = []
+_cache_counts: Counter = Counter()
+
+
+class StageRecord(NamedTuple):
+    """Measurements of one run of a pipeline stage."""
+
+    stage: str
+    seconds: float
+    rows: int | None
+    """Rows of the result, None for lazy frames which are only counted when collected."""
+    peak_memory_mb: float
+    """Growth of the peak resident memory of the process during the stage."""
+    cache_hits: int
+    cache_misses: int
+
+
+def enable():
+    """Start recording stages. Recording is off by default and costs nothing then."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording stages, keeping what was recorded."""
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Remove all records."""
+    _records.clear()
+    _cache_counts.clear()
+
+
+def count_cache(hit: bool):
+    """Count a cache lookup towards the stages that are running."""
+    if _enabled:
+        _cache_counts["hits" if hit else "misses"] += 1
+
+
+def _peak_memory_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _rows(result: Any) -> int | None:
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, pl.LazyFrame) or not hasattr(result, "__len__"):
+        return None
+    return len(result)
+
+
+class Stage:
+    """A running stage, see ``stage``. Set ``rows`` to record the rows processed."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: int | None = None
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[Stage]:
+    """Record the time, memory and cache lookups of a block when recording is enabled.
+
+    Example: ..code-block::
+
+        with stage("gui.combined_data") as running:
+            data = combined_data.collect()
+            running.rows = len(data)
+    """
+    running = Stage(name)
+    if not _enabled:
+        yield running
+        return
+    hits, misses = _cache_counts["hits"], _cache_counts["misses"]
+    memory = _peak_memory_mb()
+    start = time.perf_counter()
+    try:
+        yield running
+    finally:
+        _records.append(
+            StageRecord(
+                stage=name,
+                seconds=time.perf_counter() - start,
+                rows=running.rows,
+                peak_memory_mb=_peak_memory_mb() - memory,
+                cache_hits=_cache_counts["hits"] - hits,
+                cache_misses=_cache_counts["misses"] - misses,
+            )
+        )
+
+
+def instrument(function: Callable) -> Callable:
+    """Record every call of a function as a stage named ``<module>.<function>``.
+
+    The rows are those of the returned frame, or of the first item of a returned tuple.
+    """
+    name = f"{function.__module__.removeprefix('src.')}.{function.__name__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return function(*args, **kwargs)
+        with stage(name) as running:
+            result = function(*args, **kwargs)
+            running.rows = _rows(result)
+        return result
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def profiling() -> Iterator[list[StageRecord]]:
+    """Record the stages run in a block.
+
+    Example: ..code-block::
+
+        with profiling() as records:
+            app.refresh_figures()
+        print(summary(records))
+    """
+    was_enabled, start = _enabled, len(_records)
+    enable()
+    recorded: list[StageRecord] = []
+    try:
+        yield recorded
+    finally:
+        recorded.extend(_records[start:])
+        if not was_enabled:
+            disable()
+
+
+def records() -> pl.DataFrame:
+    """All records, one row per stage run, with the fields of ``StageRecord``."""
+    return pl.DataFrame(
+        _records,
+        schema={
+            "stage": pl.String,
+            "seconds": pl.Float64,
+            "rows": pl.Int64,
+            "peak_memory_mb": pl.Float64,
+            "cache_hits": pl.Int64,
+            "cache_misses": pl.Int64,
+        },
+        orient="row",
+    )
+
+
+def summary(data: pl.DataFrame | list[StageRecord] | None = None) -> pl.DataFrame:
+    """Totals per stage, slowest first.
+
+    Args:
+        data (pl.DataFrame | list[StageRecord] | None): Records, all by default.
+
+    Returns:
+        pl.DataFrame: One row per stage with columns ``stage``, ``calls``,
+        ``seconds`` (total), ``mean_seconds``, ``rows`` (total), ``peak_memory_mb``
+        (largest), ``cache_hits`` and ``cache_misses``.
+    """
+    if data is None:
+        data = records()
+    elif isinstance(data, list):
+        data = pl.DataFrame(data, schema=records().schema, orient="row")
+    return (
+        data.group_by("stage")
+        .agg(
+            calls=pl.len(),
+            seconds=pl.col("seconds").sum(),
+            mean_seconds=pl.col("seconds").mean(),
+            rows=pl.when(pl.col("rows").is_not_null().any()).then(pl.col("rows").sum()),
+            peak_memory_mb=pl.col("peak_memory_mb").max(),
+            cache_hits=pl.col("cache_hits").sum(),
+            cache_misses=pl.col("cache_misses").sum(),
+        )
+        .sort("seconds", descending=True)
+    )
+
+
+def export(path: str | Path):
+    """Write all records as JSON lines, one object per stage run."""
+    with open(path, "w") as file:
+        for record in _records:
+            file.write(json.dumps(record._asdict()) + "\n")
@@ -1,87 +1,58 @@
-from pathlib import Path
+from typing import Sequence
 
 import folium
-import geopandas as gpd
-import numpy as np
 
-LOCATION_DATA = Path(__file__).parent.parent / "location"
+from .geometry import WindfarmGeometries, load_geometries
+from .instrumentation import instrument
+from .overlay import add_overlay
 
+COLORS = {"nordsen iii vest": "blue", "e2": "green"}
 
-def generate_map(windfarm):
-    # Load the GeoJSON files
-    gdf_denmark = gpd.read_file(LOCATION_DATA / "denmark.json")  # Denmark data
-    gdf_latvia = gpd.read_file(LOCATION_DATA / "latvia.json")  # Latvia data
 
-    # Filter the GeoDataFrames
-    nordsren_iii_vest = gdf_denmark[gdf_denmark["name"] == "Nordsen III vest"]
-    latvia_wind_farm = gdf_latvia
+@instrument
+def generate_map(
+    windfarm: str | Sequence[str],
+    zoom_start: int = 7,
+    overlay: str | None = None,
+    geometries: WindfarmGeometries | None = None,
+) -> folium.Map:
+    """Map of one or more wind farms, centred on the first.
 
-    # Function to calculate the average coordinates from a GeoDataFrame
-    def calculate_average_coords(gdf: gpd.GeoDataFrame):
-        lats, lons = [], []
-        for geom in gdf.geometry:
-            if geom.geom_type == "MultiPolygon":
-                for polygon in geom.geoms:
-                    xs, ys = polygon.exterior.xy
-                    lats.extend(ys)
-                    lons.extend(xs)
-            elif geom.geom_type == "Polygon":
-                xs, ys = geom.exterior.xy
-                lats.extend(ys)
-                lons.extend(xs)
-        return np.mean(lats), np.mean(lons)
+    The polygons come from the shared, indexed geometries of ``load_geometries``,
+    simplified to what is visible at ``zoom_start``.
 
-    # Function to extract coordinates for plotting
-    def extract_coords(gdf):
-        coords = []
-        for geom in gdf.geometry:
-            if geom.geom_type == "MultiPolygon":
-                for polygon in geom.geoms:
-                    exterior_coords = [
-                        [point[1], point[0]] for point in polygon.exterior.coords
-                    ]
-                    coords.append(exterior_coords)
-            elif geom.geom_type == "Polygon":
-                exterior_coords = [
-                    [point[1], point[0]] for point in geom.exterior.coords
-                ]
-                coords.append(exterior_coords)
-        return coords
+    Args:
+        windfarm (str | Sequence[str]): Wind farm name or names.
+        zoom_start (int): Initial zoom level.
+        overlay (str | None): Grid metric to show underneath the wind farms, see
+            ``src.overlay.METRICS``.
+        geometries (WindfarmGeometries | None): Wind farms to draw from,
+            ``load_geometries`` by default.
 
-    # Calculate average coordinates for Denmark and Latvia individually
-    lat_denmark, lon_denmark = calculate_average_coords(nordsren_iii_vest)
-    lat_latvia, lon_latvia = calculate_average_coords(latvia_wind_farm)
+    Returns:
+        folium.Map: The map.
+    """
+    windfarms = [windfarm] if isinstance(windfarm, str) else list(windfarm)
+    if geometries is None:
+        geometries = load_geometries()
 
     # Create focused maps based on user selection
     focused_map = folium.Map(
-        location=(
-            [lat_denmark, lon_denmark]
-            if windfarm == "nordsen iii vest"
-            else [lat_latvia, lon_latvia]
-        ),
-        zoom_start=7,
+        location=geometries.centroid(windfarms[0]), zoom_start=zoom_start
     )
 
-    # Add polygons based on user selection
-    if windfarm == "nordsen iii vest":
-        denmark_coords = extract_coords(nordsren_iii_vest)
-        for polygon in denmark_coords:
-            folium.Polygon(
-                locations=polygon,
-                color="blue",
-                fill=True,
-                fill_color="blue",
-                fill_opacity=0.5,
-            ).add_to(focused_map)
+    if overlay is not None:
+        add_overlay(focused_map, overlay)
 
-    elif windfarm == "e2":
-        latvia_coords = extract_coords(latvia_wind_farm)
-        for polygon in latvia_coords:
+    # Add polygons based on user selection
+    for name in windfarms:
+        color = COLORS.get(name.lower(), "blue")
+        for polygon in geometries.outlines(name, zoom=zoom_start):
             folium.Polygon(
                 locations=polygon,
-                color="green",
+                color=color,
                 fill=True,
-                fill_color="green",
+                fill_color=color,
                 fill_opacity=0.5,
             ).add_to(focused_map)
 
@@ -1,5 +1,11 @@
+from datetime import datetime
+from typing import Sequence
+
 import polars as pl
 
+from .cache import scan_csv
+from .instrumentation import instrument
+
 SCHEMA = {
     "Country": pl.Categorical,
     "ISO3 Code": pl.Categorical,
@@ -9,24 +15,51 @@ SCHEMA = {
 }
 
 
-def read_price_data(path: str) -> pl.LazyFrame:
+@instrument
+def read_price_data(
+    path: str,
+    start: datetime | None = None,
+    end: datetime | None = datetime(2020, 1, 1),
+    countries: Sequence[str] | None = None,
+) -> pl.LazyFrame:
     """Read the price history.
 
-    See ``SCHEMA`` variable for the expected CSV structure.
+    See ``SCHEMA`` variable for the expected CSV structure. The time window and country
+    filter are applied directly on the scan, so only matching rows are materialised.
+
+    Args:
+        path (str): Price CSV file.
+        start (datetime | None): First local time to include.
+        end (datetime | None): Local time to stop before, prices up to 2019 by default.
+        countries (Sequence[str] | None): Country names or ISO3 codes to include, all
+            if not given.
 
     Returns:
         pl.LazyFrame: A lazy frame with columns ``time`` and ``price``.
     """
-    price_data = (
-        pl.read_csv(path, schema=SCHEMA)
-        .lazy()
-        .select(
-            [
-                pl.col("Datetime (Local)").alias("time"),
-                pl.col("Price (EUR/MWhe)").alias("price"),
-            ]
+    price_data = scan_csv(path, schema=SCHEMA)
+    if start is not None:
+        price_data = price_data.filter(pl.col("Datetime (Local)") >= start)
+    if end is not None:
+        price_data = price_data.filter(pl.col("Datetime (Local)") < end)
+    if countries is not None:
+        price_data = price_data.filter(
+            pl.col("Country").is_in(countries) | pl.col("ISO3 Code").is_in(countries)
         )
+    price_data = price_data.select(
+        [
+            pl.col("Datetime (Local)").alias("time"),
+            pl.col("Price (EUR/MWhe)").alias("price"),
+        ]
     )
-    price_data = price_data.set_sorted(pl.col("time"))
-    price_data = price_data.filter(pl.col("time").dt.year() < 2020)
+    price_data = price_data.set_sorted("time")
     return price_data
+
+
+def hourly_prices(price_data: pl.LazyFrame) -> pl.LazyFrame:
+    """One price per hour of a ``read_price_data`` frame, to join on ``time``.
+
+    Local time repeats an hour when daylight saving time ends, so the price file has
+    two rows for it. They are averaged, so a join keeps one row per weather hour.
+    """
+    return price_data.group_by("time").agg(pl.col("price").mean()).sort("time")
@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+import folium
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import polars as pl
+from branca.colormap import LinearColormap
+
+from .cache import CACHE_DIR, source_key
+from .grid import GRID_FILE, grid_impingement, read_climate_grid
+from .instrumentation import count_cache
+from .turbines import TURBINES
+
+OVERLAY_DIR = CACHE_DIR / "overlays"
+
+METRICS = {
+    "wind_speed": "Mean wind speed (m/s)",
+    "r_impg_per_year": "Impingement per year",
+    "lifetime": "Erosion lifetime (years)",
+    "efficiency_loss_per_year": "Efficiency loss per year (%)",
+}
+"""Grid metrics that can be shown, see ``src.grid.grid_impingement``."""
+
+
+class Overlay(NamedTuple):
+    """A rendered overlay image and where it goes on the map."""
+
+    image: Path
+    bounds: list[list[float]]
+    """South-west and north-east corners as ``[latitude, longitude]``."""
+    vmin: float
+    vmax: float
+
+
+def _mercator(latitude: np.ndarray) -> np.ndarray:
+    return np.log(np.tan(np.pi / 4 + np.radians(latitude) / 2))
+
+
+def render_overlay(
+    xlat: np.ndarray, xlong: np.ndarray, value: np.ndarray, resolution: float = 0.1
+) -> tuple[np.ndarray, list[list[float]]]:
+    """Bin scattered values into an image aligned with the web map.
+
+    Rows are evenly spaced in Web Mercator, like the map itself, so the image can be
+    stretched over its bounds without distortion. Empty bins are NaN.
+
+    Args:
+        xlat (np.ndarray): Latitude of each value.
+        xlong (np.ndarray): Longitude of each value.
+        value (np.ndarray): Values to bin.
+        resolution (float): Bin width (degrees of longitude).
+
+    Returns:
+        tuple[np.ndarray, list[list[float]]]: Mean value per bin, north up, and the
+        bounds of the image, see ``Overlay.bounds``.
+    """
+    south, north = xlat.min() - resolution / 2, xlat.max() + resolution / 2
+    west, east = xlong.min() - resolution / 2, xlong.max() + resolution / 2
+    y, y_min, y_max = _mercator(xlat), _mercator(south), _mercator(north)
+    columns = max(int(np.ceil((east - west) / resolution)), 1)
+    rows = max(int(np.ceil((y_max - y_min) / np.radians(resolution))), 1)
+
+    column = np.minimum(
+        ((xlong - west) / (east - west) * columns).astype(int), columns - 1
+    )
+    row = np.minimum(((y_max - y) / (y_max - y_min) * rows).astype(int), rows - 1)
+    index = row * columns + column
+    total = np.bincount(index, weights=value, minlength=rows * columns)
+    count = np.bincount(index, minlength=rows * columns)
+    with np.errstate(invalid="ignore"):
+        image = (total / count).reshape(rows, columns)
+    return image, [[south, west], [north, east]]
+
+
+def grid_overlay(
+    metric: str,
+    turbine: str = "IEA 15 240",
+    tip_speed_cap: float | None = None,
+    resolution: float = 0.1,
+    colormap: str = "viridis",
+    path: str | Path = GRID_FILE,
+) -> Overlay:
+    """Render a grid-wide metric as a coloured PNG, cached on disk.
+
+    The image is stored under ``OVERLAY_DIR`` with a key of the grid file and the
+    arguments, so it is only rendered again when one of them changes.
+
+    Args:
+        metric (str): Metric to show, see ``METRICS``.
+        turbine (str): Turbine to evaluate, see ``src.turbines.TURBINES``.
+        tip_speed_cap (float | None): Maximum tip speed (m/s) during rain.
+        resolution (float): Bin width (degrees of longitude), see ``render_overlay``.
+        colormap (str): Matplotlib colormap.
+        path (str | Path): Climate grid file, see ``src.grid.read_climate_grid``.
+    """
+    key = source_key(path, extra=[metric, turbine, tip_speed_cap, resolution, colormap])
+    image = OVERLAY_DIR / f"{key}.png"
+    info = image.with_suffix(".json")
+    count_cache(info.exists())
+    if not info.exists():
+        data = (
+            grid_impingement(
+                read_climate_grid(path), {turbine: TURBINES[turbine]}, tip_speed_cap
+            )
+            .select("xlat", "xlong", metric)
+            .filter(pl.col(metric).is_finite())
+            .collect()
+        )
+        values, bounds = render_overlay(
+            data["xlat"].to_numpy(),
+            data["xlong"].to_numpy(),
+            data[metric].to_numpy(),
+            resolution,
+        )
+        # Percentiles keep a few extreme cells from washing out the colour scale.
+        vmin, vmax = map(float, np.nanpercentile(values, [2, 98]))
+        scaled = np.clip((values - vmin) / ((vmax - vmin) or 1), 0, 1)
+        colors = matplotlib.colormaps[colormap](scaled)
+        colors[np.isnan(values)] = 0
+
+        OVERLAY_DIR.mkdir(parents=True, exist_ok=True)
+        plt.imsave(image, colors)
+        info.write_text(json.dumps({"bounds": bounds, "vmin": vmin, "vmax": vmax}))
+
+    return Overlay(image=image, **json.loads(info.read_text()))
+
+
+def add_overlay(
+    folium_map: folium.Map,
+    metric: str,
+    opacity: float = 0.6,
+    colormap: str = "viridis",
+    **kwargs,
+) -> folium.Map:
+    """Add a grid metric and its legend to a map, see ``grid_overlay``.
+
+    Args:
+        folium_map (folium.Map): Map to add the overlay to.
+        metric (str): Metric to show, see ``METRICS``.
+        opacity (float): Opacity of the overlay.
+        colormap (str): Matplotlib colormap.
+        kwargs: Further arguments of ``grid_overlay``.
+    """
+    overlay = grid_overlay(metric, colormap=colormap, **kwargs)
+    folium.raster_layers.ImageOverlay(
+        image=str(overlay.image),
+        bounds=overlay.bounds,
+        opacity=opacity,
+        name=METRICS[metric],
+    ).add_to(folium_map)
+    LinearColormap(
+        [matplotlib.colormaps[colormap](x) for x in np.linspace(0, 1, 8)],
+        vmin=overlay.vmin,
+        vmax=overlay.vmax,
+        caption=METRICS[metric],
+    ).add_to(folium_map)
+    return folium_map
@@ -1,6 +1,14 @@
 import csv
+import math
+from dataclasses import dataclass
 from typing import Sequence
 
+import numpy as np
+import numpy.typing as npt
+import polars as pl
+
+from .instrumentation import count_cache
+
 
 def read_power_curve(path: str) -> dict[str, Sequence[float]]:
     """Read a wind speed-power-turbine speed curve from CSV.
@@ -23,9 +31,196 @@ def read_power_curve(path: str) -> dict[str, Sequence[float]]:
     return curve
 
 
+def _frozen(values: npt.ArrayLike) -> np.ndarray:
+    array = np.ascontiguousarray(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class LookupTable:
+    """Values of a piecewise linear curve sampled on a uniform grid.
+
+    Evaluation computes the grid cell directly from ``x`` instead of searching, so each
+    lookup is O(1). Outside the grid the first and last cells are extended linearly.
+    """
+
+    start: float
+    step: float
+    values: np.ndarray
+
+    @classmethod
+    def build(cls, xp: npt.ArrayLike, fp: npt.ArrayLike, step: float) -> "LookupTable":
+        xp = np.asarray(xp, dtype=np.float64)
+        size = max(math.ceil((xp[-1] - xp[0]) / step), 1) + 1
+        grid = xp[0] + step * np.arange(size)
+        return cls(
+            start=float(xp[0]), step=step, values=_frozen(np.interp(grid, xp, fp))
+        )
+
+    def __call__(self, x: npt.ArrayLike) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        # Gaps in the data must not turn into indices, they stay NaN
+        finite = np.isfinite(x)
+        position = (np.where(finite, x, self.start) - self.start) / self.step
+        index = np.clip(np.floor(position), 0, len(self.values) - 2).astype(np.intp)
+        fraction = position - index
+        values = self.values[index] + fraction * (
+            self.values[index + 1] - self.values[index]
+        )
+        return np.where(finite, values, np.nan)
+
+    def expr(self, x: pl.Expr) -> pl.Expr:
+        """Same as calling the table, but on a Polars expression. NaN becomes null."""
+        position = (x.cast(pl.Float64).fill_nan(None) - self.start) / self.step
+        index = position.floor().clip(0, len(self.values) - 2).cast(pl.Int64)
+        values = pl.lit(pl.Series(self.values[:-1]))
+        deltas = pl.lit(pl.Series(np.diff(self.values)))
+        return values.gather(index) + (position - index) * deltas.gather(index)
+
+
+@dataclass(frozen=True, eq=False)
+class PowerCurve:
+    """Compiled power curve of a turbine.
+
+    Holds the curve as read-only contiguous arrays together with uniform-grid lookup
+    tables and the derived curves used throughout the project. Build it once per
+    turbine with ``compile_power_curve`` and reuse it.
+    """
+
+    wind_speed: np.ndarray
+    power: np.ndarray
+    rotor_speed: np.ndarray
+    tip_speed: np.ndarray
+    cut_in_wind_speed: float
+    cut_out_wind_speed: float
+    rated_wind_speed: float
+    rated_power: float
+    radius: float
+    operating: np.ndarray
+    """Mask of the curve points strictly between cut-in and cut-out wind speed."""
+    operating_rotor_speed: np.ndarray
+    """Increasing rotor speeds (1/min) of the operating segment."""
+    operating_power: np.ndarray
+    """Highest power (MW) reachable at or below ``operating_rotor_speed``."""
+    power_table: LookupTable
+    rotor_speed_table: LookupTable
+
+    @classmethod
+    def from_turbine(cls, turbine: dict, step: float = 0.001) -> "PowerCurve":
+        """Compile the power curve of a turbine.
+
+        Args:
+            turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+            step (float): Wind speed resolution (m/s) of the lookup tables.
+        """
+        curve = turbine["power_curve"]
+        order = np.argsort(curve["wind_speed"], kind="stable")
+        wind_speed = _frozen(np.asarray(curve["wind_speed"])[order])
+        power = _frozen(np.asarray(curve["power"])[order])
+        rotor_speed = _frozen(np.asarray(curve["rotor_speed"])[order])
+
+        operating = (wind_speed > turbine["cut_in_wind_speed"]) & (
+            wind_speed < turbine["cut_out_wind_speed"]
+        )
+        operating.flags.writeable = False
+        by_rotor_speed = np.argsort(rotor_speed[operating], kind="stable")
+        operating_rotor_speed, first = np.unique(
+            rotor_speed[operating][by_rotor_speed], return_index=True
+        )
+        highest_power = np.maximum.accumulate(power[operating][by_rotor_speed])
+        last = np.r_[first[1:], len(highest_power)] - 1
+
+        return cls(
+            wind_speed=wind_speed,
+            power=power,
+            rotor_speed=rotor_speed,
+            tip_speed=_frozen(rotor_speed * np.pi / 30 * turbine["radius"]),
+            cut_in_wind_speed=float(turbine["cut_in_wind_speed"]),
+            cut_out_wind_speed=float(turbine["cut_out_wind_speed"]),
+            rated_wind_speed=float(turbine["rated_wind_speed"]),
+            rated_power=float(power[operating].max()),
+            radius=float(turbine["radius"]),
+            operating=operating,
+            operating_rotor_speed=_frozen(operating_rotor_speed),
+            operating_power=_frozen(highest_power[last]),
+            power_table=LookupTable.build(wind_speed, power, step),
+            rotor_speed_table=LookupTable.build(wind_speed, rotor_speed, step),
+        )
+
+    def get_power(self, wind_speed: npt.ArrayLike) -> np.ndarray:
+        """Power (MW) at the given wind speeds, see ``power_at_wind_speed``."""
+        wind_speed = np.asarray(wind_speed, dtype=np.float64)
+        power = np.where(
+            wind_speed >= self.rated_wind_speed,
+            self.rated_power,
+            self.power_table(
+                np.clip(wind_speed, self.wind_speed[0], self.wind_speed[-1])
+            ),
+        )
+        return np.where(
+            (wind_speed < self.cut_in_wind_speed)
+            | (wind_speed > self.cut_out_wind_speed),
+            0.0,
+            power,
+        )
+
+    def get_rotor_speed(self, wind_speed: npt.ArrayLike) -> np.ndarray:
+        """Rotor speed (1/min) at the given wind speeds, extrapolated linearly outside the curve."""
+        return self.rotor_speed_table(wind_speed)
+
+    def get_power_at_rotor_speed(self, rotor_speed: npt.ArrayLike) -> np.ndarray:
+        """Highest power (MW) the turbine produces without exceeding the given rotor speed."""
+        return np.interp(rotor_speed, self.operating_rotor_speed, self.operating_power)
+
+
+_COMPILED: dict[int, tuple[dict, PowerCurve]] = {}
+
+
+def compile_power_curve(turbine: dict) -> PowerCurve:
+    """Get the compiled ``PowerCurve`` of a turbine, building it on first use."""
+    cached = _COMPILED.get(id(turbine))
+    count_cache(cached is not None and cached[0] is turbine)
+    if cached is None or cached[0] is not turbine:
+        cached = _COMPILED[id(turbine)] = (turbine, PowerCurve.from_turbine(turbine))
+    return cached[1]
+
+
+def power_at_wind_speed(wind_speed: pl.Expr, turbine: dict) -> pl.Expr:
+    """Power output (MW) of a turbine for a column of wind speeds.
+
+    Below cut-in and above cut-out the turbine produces nothing, between rated and
+    cut-out wind speed it produces rated power. In between the power curve is
+    interpolated linearly. Missing and NaN wind speeds give null.
+
+    Args:
+        wind_speed (pl.Expr): Wind speed (m/s).
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+    """
+    curve = compile_power_curve(turbine)
+    wind_speed = wind_speed.cast(pl.Float64).fill_nan(None)
+    return (
+        pl.when(
+            (wind_speed < curve.cut_in_wind_speed)
+            | (wind_speed > curve.cut_out_wind_speed)
+        )
+        .then(0.0)
+        .when(wind_speed >= curve.rated_wind_speed)
+        .then(curve.rated_power)
+        .otherwise(
+            curve.power_table.expr(
+                wind_speed.clip(curve.wind_speed[0], curve.wind_speed[-1])
+            )
+        )
+    )
+
+
 def get_power_at_wind_velocity(
-    wind_speed: float, curve: dict[str, Sequence[float]]
-) -> float:
-    """Get the power output at a given wind speed."""
-    # TODO: Something here that returns the power (MW) at the given wind speed.
-    raise NotImplementedError()
+    wind_speed: float | npt.ArrayLike, turbine: dict
+) -> float | np.ndarray:
+    """Get the power output (MW) at the given wind speed(s).
+
+    NumPy counterpart of ``power_at_wind_speed``, accepts scalars and arrays.
+    """
+    power = compile_power_curve(turbine).get_power(wind_speed)
+    return power if power.ndim else float(power)
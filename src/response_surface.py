@@ -0,0 +1,113 @@
+from typing import Sequence
+
+import numpy as np
+import polars as pl
+
+from .energy_yield import energy_yield
+from .grid import HOURS_PER_YEAR
+from .impingement import WINDFARM_FILES
+from .market import hourly_prices
+from .power_curve import compile_power_curve
+from .weather import read_weather_data
+
+
+def tip_speed_grid(turbine: dict, step: float = 1.0) -> np.ndarray:
+    """Tip speed caps (m/s) from the slowest to the fastest tip speed of a turbine."""
+    curve = compile_power_curve(turbine)
+    tip_speed = curve.tip_speed[(curve.power > 0) & (curve.tip_speed > 0)]
+    start = np.floor(tip_speed.min() / step) * step
+    return np.arange(start, tip_speed.max() + step, step)
+
+
+def response_surface(
+    turbine: dict,
+    weather_data: pl.DataFrame,
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+    price_data: pl.LazyFrame | None = None,
+) -> pl.DataFrame:
+    """Consequences of each tip speed cap at a site, to look up instead of recompute.
+
+    All caps are evaluated together by ``energy_yield``.
+
+    Args:
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        weather_data (pl.DataFrame): Hourly weather with columns ``time``,
+            ``wind_speed`` and ``rain``.
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+        price_data (pl.LazyFrame | None): Prices, see ``src.market.read_price_data``.
+            Hours without a price add nothing to the revenue, an hour with two prices
+            (when daylight saving time ends) earns their mean.
+
+    Returns:
+        pl.DataFrame: One row per cap with columns ``tip_speed_cap``, ``power_cap``
+        (MW, the power at the cap), ``efficiency`` (%, at the end), ``energy_yield``
+        (MWh), ``revenue`` (null without prices) and ``lifetime`` (years until the
+        coating erosion limit).
+    """
+    price = None
+    if price_data is not None:
+        price = (
+            weather_data.lazy()
+            .join(
+                hourly_prices(price_data), on="time", how="left", maintain_order="left"
+            )
+            .select(pl.col("price").fill_null(0))
+            .collect()
+            .to_series()
+            .to_numpy()
+        )
+    summary = energy_yield(
+        turbine,
+        weather_data["wind_speed"].to_numpy(),
+        weather_data["rain"].to_numpy(),
+        tip_speed_caps,
+        coating,
+        price=price,
+    )
+    curve = compile_power_curve(turbine)
+    omega_max = summary.tip_speed_caps / turbine["radius"]
+    years = len(weather_data) / HOURS_PER_YEAR
+    with np.errstate(divide="ignore"):
+        lifetime = summary.r_acc_limit / (summary.r_impg_acc_sum / years)
+
+    return pl.DataFrame(
+        {
+            "tip_speed_cap": summary.tip_speed_caps,
+            "power_cap": np.maximum(
+                curve.get_power_at_rotor_speed(omega_max * 30 / np.pi), 0
+            ),
+            "efficiency": summary.efficiency,
+            "energy_yield": summary.energy_yield,
+            "revenue": (
+                summary.revenue
+                if summary.revenue is not None
+                else [None] * len(summary.tip_speed_caps)
+            ),
+            "lifetime": lifetime,
+        },
+        schema_overrides={"revenue": pl.Float64},
+    )
+
+
+def site_response_surface(
+    turbine: dict,
+    windfarm: str,
+    tip_speed_caps: Sequence[float] | None = None,
+    coating: str = "GS",
+    price_data: pl.LazyFrame | None = None,
+) -> pl.DataFrame:
+    """``response_surface`` over the climate data of a wind farm.
+
+    Args:
+        windfarm (str): Wind farm, see ``src.impingement.WINDFARM_FILES``.
+        tip_speed_caps (Sequence[float] | None): Caps to evaluate, every m/s across
+            the turbine's tip speeds by default, see ``tip_speed_grid``.
+    """
+    if tip_speed_caps is None:
+        tip_speed_caps = tip_speed_grid(turbine)
+    weather_data = read_weather_data(
+        WINDFARM_FILES[windfarm], columns=("wind_speed", "rain")
+    ).collect()
+    return response_surface(turbine, weather_data, tip_speed_caps, coating, price_data)
@@ -0,0 +1,132 @@
+from typing import Sequence
+
+import numpy as np
+import polars as pl
+
+from .impingement import efficiency, erosion_limit, impingement_rate
+from .market import hourly_prices
+from .power_curve import compile_power_curve, power_at_wind_speed
+
+
+def _turbine_revenue(
+    combined_data: pl.LazyFrame,
+    name: str,
+    turbine: dict,
+    tip_speed_caps: np.ndarray,
+    coating: str,
+) -> pl.LazyFrame:
+    curve = compile_power_curve(turbine)
+    radius = turbine["radius"]
+    r_acc_limit = erosion_limit(turbine, coating)
+    caps = pl.LazyFrame(
+        {
+            "tip_speed_cap": tip_speed_caps,
+            "omega_max": tip_speed_caps / radius,
+            "power_max": np.maximum(
+                curve.get_power_at_rotor_speed(tip_speed_caps / radius * 30 / np.pi), 0
+            ),
+        }
+    )
+    wet = pl.col("rain") > 0
+    scenario = pl.col("tip_speed_cap")
+
+    return (
+        combined_data.with_columns(
+            turbine=pl.lit(name),
+            power=power_at_wind_speed(pl.col("wind_speed"), turbine),
+            omega=(2 * np.pi / 60) * curve.rotor_speed_table.expr(pl.col("wind_speed")),
+        )
+        .join(caps, how="cross")
+        .with_columns(
+            omega=pl.when(wet & (pl.col("omega") > pl.col("omega_max")))
+            .then(pl.col("omega_max"))
+            .otherwise(pl.col("omega")),
+            power=pl.when(wet)
+            .then(pl.min_horizontal("power", "power_max"))
+            .otherwise(pl.col("power")),
+        )
+        .with_columns(
+            r_impg=impingement_rate(
+                pl.col("rain"),
+                (pl.col("wind_speed") ** 2 + (pl.col("omega") * radius) ** 2).sqrt(),
+            )
+        )
+        .with_columns(
+            lossvector=efficiency(
+                pl.col("r_impg").cum_sum().over(scenario, order_by="time"), r_acc_limit
+            )
+        )
+        .with_columns(
+            income=pl.col("power") * pl.col("lossvector") / 100 * pl.col("price")
+        )
+        .with_columns(
+            cumulative_income=pl.col("income").cum_sum().over(scenario, order_by="time")
+        )
+        .select(
+            [
+                "time",
+                "turbine",
+                "tip_speed_cap",
+                "price",
+                "power",
+                "lossvector",
+                "income",
+                "cumulative_income",
+            ]
+        )
+    )
+
+
+def revenue(
+    weather_data: pl.LazyFrame,
+    price_data: pl.LazyFrame,
+    turbines: dict[str, dict],
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+) -> pl.LazyFrame:
+    """Hourly income of every turbine and tip speed cap, including erosion losses.
+
+    Builds one lazy query: weather and prices are joined on time, then for each turbine
+    the hourly rows are crossed with the caps, power is capped during rain, and the
+    impingement, efficiency loss and income are accumulated per cap in time order.
+
+    Args:
+        weather_data (pl.LazyFrame): Weather data with columns ``time``, ``wind_speed``
+            and ``rain``, see ``src.weather.read_weather_data``.
+        price_data (pl.LazyFrame): Price data, see ``src.market.read_price_data``.
+        turbines (dict[str, dict]): Turbines by name, see ``src.turbines.TURBINES``.
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+
+    Returns:
+        pl.LazyFrame: One row per hour, turbine and cap with columns ``time``,
+        ``turbine``, ``tip_speed_cap``, ``price``, ``power`` (MW, capped),
+        ``lossvector`` (%), ``income`` and ``cumulative_income``.
+    """
+    combined_data = weather_data.join(hourly_prices(price_data), on="time", how="inner")
+    tip_speed_caps = np.asarray(tip_speed_caps, dtype=np.float64)
+    return pl.concat(
+        [
+            _turbine_revenue(combined_data, name, turbine, tip_speed_caps, coating)
+            for name, turbine in turbines.items()
+        ]
+    )
+
+
+def total_revenue(revenue: pl.LazyFrame) -> pl.LazyFrame:
+    """Lifetime totals per scenario of a ``revenue`` frame.
+
+    Returns:
+        pl.LazyFrame: One row per turbine and cap with columns ``turbine``,
+        ``tip_speed_cap``, ``energy_yield`` (MWh, including erosion losses),
+        ``efficiency`` (%, at the end) and ``income``.
+    """
+    return (
+        revenue.group_by("turbine", "tip_speed_cap")
+        .agg(
+            energy_yield=(pl.col("power") * pl.col("lossvector") / 100).sum(),
+            efficiency=pl.col("lossvector").sort_by("time").last(),
+            income=pl.col("cumulative_income").sort_by("time").last(),
+        )
+        .sort("turbine", "tip_speed_cap")
+    )
@@ -0,0 +1,107 @@
+import itertools
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import polars as pl
+
+from .energy_yield import energy_yield
+from .erosion import COATINGS
+from .impingement import WINDFARM_FILES, _read_climate_data
+from .turbines import TURBINES
+
+_CLIMATE: dict[str, np.ndarray] = {}
+"""Climate arrays of each wind farm in the current worker, rows are wind speed and rain."""
+_SHARED: list[SharedMemory] = []
+
+
+def _share_climate(windfarm: str) -> tuple[SharedMemory, int]:
+    climate = _read_climate_data(windfarm)
+    size = len(climate)
+    memory = SharedMemory(create=True, size=max(2 * size * 8, 1))
+    array = np.ndarray((2, size), dtype=np.float64, buffer=memory.buf)
+    array[0] = climate["wsp_150.0"]
+    array[1] = climate["qrain_150.0"]
+    return memory, size
+
+
+def _attach_climate(layout: dict[str, tuple[str, int]]):
+    for windfarm, (name, size) in layout.items():
+        memory = SharedMemory(name=name)
+        _SHARED.append(memory)
+        _CLIMATE[windfarm] = np.ndarray((2, size), dtype=np.float64, buffer=memory.buf)
+
+
+def _run_scenario(task: tuple[str, str, str, np.ndarray]) -> pl.DataFrame:
+    windfarm, turbine, coating, tip_speed_caps = task
+    wind_speed, rain = _CLIMATE[windfarm]
+    summary = energy_yield(TURBINES[turbine], wind_speed, rain, tip_speed_caps, coating)
+    return pl.DataFrame(
+        {
+            "windfarm": windfarm,
+            "turbine": turbine,
+            "coating": coating,
+            "tip_speed_cap": summary.tip_speed_caps,
+            "r_acc_limit": summary.r_acc_limit,
+            "r_impg_acc_sum": summary.r_impg_acc_sum,
+            "efficiency": summary.efficiency,
+            "energy_yield": summary.energy_yield,
+            "energy_yield_no_loss": summary.energy_yield_no_loss,
+        }
+    )
+
+
+def run_scenarios(
+    output: str | Path,
+    windfarms: Sequence[str] = tuple(WINDFARM_FILES),
+    turbines: Sequence[str] = tuple(TURBINES),
+    coatings: Sequence[str] = COATINGS,
+    tip_speed_caps: Sequence[float] = np.linspace(1.001, 100, 20),
+    caps_per_task: int = 16,
+    processes: int | None = None,
+) -> Path:
+    """Evaluate every combination of wind farm, turbine, coating and tip speed cap.
+
+    The climate data of each wind farm is read once into shared memory which the worker
+    processes map directly, so tasks only carry the scenario parameters. Results are
+    appended to ``output`` as they complete, in no particular order.
+
+    Args:
+        output (str | Path): CSV file to write, one row per scenario.
+        windfarms (Sequence[str]): Wind farms, see ``WINDFARM_FILES``.
+        turbines (Sequence[str]): Turbine names, see ``src.turbines.TURBINES``.
+        coatings (Sequence[str]): Blade coatings, see ``COATINGS``.
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        caps_per_task (int): Number of caps evaluated together by a worker.
+        processes (int | None): Number of worker processes, one per core by default.
+
+    Returns:
+        Path: The output file.
+    """
+    output = Path(output)
+    tip_speed_caps = np.asarray(tip_speed_caps, dtype=np.float64)
+    chunks = np.array_split(
+        tip_speed_caps, max(len(tip_speed_caps) // caps_per_task, 1)
+    )
+    shared = {windfarm: _share_climate(windfarm) for windfarm in windfarms}
+    layout = {
+        windfarm: (memory.name, size) for windfarm, (memory, size) in shared.items()
+    }
+    tasks = itertools.product(windfarms, turbines, coatings, chunks)
+    try:
+        # Polars' thread pool does not survive a fork, so workers are spawned.
+        with (
+            multiprocessing.get_context("spawn").Pool(
+                processes, initializer=_attach_climate, initargs=(layout,)
+            ) as pool,
+            open(output, "w") as buffer,
+        ):
+            for index, result in enumerate(pool.imap_unordered(_run_scenario, tasks)):
+                result.write_csv(buffer, include_header=index == 0)
+    finally:
+        for memory, _ in shared.values():
+            memory.close()
+            memory.unlink()
+    return output
@@ -0,0 +1,156 @@
+import warnings
+
+import numpy as np
+import polars as pl
+import shapely
+
+from .geometry import WindfarmGeometries, load_geometries
+
+
+def grid_spacing(points: np.ndarray) -> float:
+    """Typical distance (degrees) between neighbouring grid points.
+
+    Args:
+        points (np.ndarray): Point geometries of the grid.
+    """
+    tree = shapely.STRtree(points)
+    _, distance = tree.query_nearest(points, return_distance=True, exclusive=True)
+    return float(np.median(distance))
+
+
+def grid_cells(points: np.ndarray, margin: float | None = None) -> np.ndarray:
+    """Cell of every grid point: the area closer to it than to any other point.
+
+    The climate grid is regular in its map projection, not in longitude and latitude,
+    so its points are sheared and further apart in longitude than in latitude. Voronoi
+    cells follow that layout and tile the grid without gaps or overlaps.
+
+    Args:
+        points (np.ndarray): Point geometries of the grid.
+        margin (float | None): How far (degrees) the outer cells reach beyond the
+            outermost points, half the typical distance between points by default.
+
+    Returns:
+        np.ndarray: One polygon per point, in the order of ``points``.
+    """
+    if margin is None:
+        margin = grid_spacing(points) / 2
+    grid = shapely.multipoints(points)
+    outline = shapely.buffer(shapely.convex_hull(grid), margin, join_style="mitre")
+    regions = shapely.get_parts(shapely.voronoi_polygons(grid, extend_to=outline))
+    point, region = shapely.STRtree(regions).query(points, predicate="within")
+    cells = np.empty(len(points), dtype=object)
+    cells[point] = shapely.intersection(regions[region], outline)
+    return cells
+
+
+def farm_cells(
+    grid: pl.LazyFrame,
+    geometries: WindfarmGeometries | None = None,
+    margin: float | None = None,
+    max_distance: float | None = None,
+) -> pl.DataFrame:
+    """Find the climate grid cells covering each wind farm.
+
+    Every grid point stands for its cell, see ``grid_cells``. The cells are put in an
+    R-tree, which is queried with all farm polygons at once; each overlapping cell is
+    weighted by the share of the farm area it covers. Farms just outside the grid get
+    the nearest cell, farms further than ``max_distance`` from it are left out with a
+    warning, as the grid says nothing about their climate.
+
+    Args:
+        grid (pl.LazyFrame): Grid with columns ``xlat`` and ``xlong``, see
+            ``src.grid.read_climate_grid``.
+        geometries (WindfarmGeometries | None): Wind farms, see
+            ``src.geometry.load_geometries``.
+        margin (float | None): How far (degrees) the outer cells reach beyond the
+            outermost points, see ``grid_cells``.
+        max_distance (float | None): How far (degrees) a farm may be from the nearest
+            cell, twice the typical distance between grid points by default.
+
+    Returns:
+        pl.DataFrame: One row per farm and cell with columns ``name``, ``xlat``,
+        ``xlong`` and ``weight``, where the weights of a farm add up to one.
+    """
+    if geometries is None:
+        geometries = load_geometries()
+    points = grid.select("xlat", "xlong").unique().collect()
+    xlat, xlong = points["xlat"].to_numpy(), points["xlong"].to_numpy()
+    points = shapely.points(xlong, xlat)
+    cells = grid_cells(points, margin)
+    if max_distance is None:
+        max_distance = 2 * grid_spacing(points)
+    tree = shapely.STRtree(cells)
+
+    named = geometries.data["name"].map(lambda name: isinstance(name, str)).to_numpy()
+    farms = geometries.data.geometry.values[named]
+    names = geometries.data["name"].to_numpy()[named]
+
+    farm, cell = tree.query(farms, predicate="intersects")
+    area = shapely.area(shapely.intersection(farms[farm], cells[cell]))
+    uncovered = np.setdiff1d(np.arange(len(farms)), farm)
+    if len(uncovered):
+        nearest_farm, nearest_cell = tree.query_nearest(
+            farms[uncovered], max_distance=max_distance
+        )
+        outside = np.setdiff1d(uncovered, uncovered[nearest_farm])
+        if len(outside):
+            warnings.warn(
+                f"Wind farms further than {max_distance:.3g} degrees from the climate "
+                f"grid are left out: {', '.join(names[outside])}."
+            )
+        farm = np.concatenate([farm, uncovered[nearest_farm]])
+        cell = np.concatenate([cell, nearest_cell])
+        area = np.concatenate([area, np.ones(len(nearest_cell))])
+
+    return (
+        pl.DataFrame(
+            {
+                "name": names[farm],
+                "xlat": xlat[cell],
+                "xlong": xlong[cell],
+                "area": area,
+            }
+        )
+        .filter(pl.col("area") > 0)
+        .with_columns(weight=pl.col("area") / pl.col("area").sum().over("name"))
+        .drop("area")
+        .sort("name", "xlat", "xlong")
+    )
+
+
+def farm_climate(
+    grid: pl.LazyFrame,
+    geometries: WindfarmGeometries | None = None,
+    margin: float | None = None,
+    max_distance: float | None = None,
+) -> pl.LazyFrame:
+    """Area-weighted long-term climate of each wind farm.
+
+    The result has the columns of the grid, so it can be passed to
+    ``src.grid.grid_impingement`` to evaluate any farm in the GeoJSON files.
+
+    Args:
+        grid (pl.LazyFrame): Climate grid, see ``src.grid.read_climate_grid``.
+        geometries (WindfarmGeometries | None): Wind farms, see ``farm_cells``.
+        margin (float | None): Reach of the outer cells (degrees), see ``grid_cells``.
+        max_distance (float | None): How far (degrees) a farm may be from the grid,
+            see ``farm_cells``.
+
+    Returns:
+        pl.LazyFrame: One row per farm with columns ``name``, ``xlat`` and ``xlong``
+        (weighted centre of the cells) and the weighted ``wind_speed`` and ``rain``.
+    """
+    cells = farm_cells(grid, geometries, margin, max_distance)
+    values = [
+        name for name in grid.collect_schema().names() if name not in ("xlat", "xlong")
+    ]
+    return (
+        cells.lazy()
+        .join(grid, on=["xlat", "xlong"], how="inner")
+        .group_by("name", maintain_order=True)
+        .agg(
+            (pl.col(name) * pl.col("weight")).sum()
+            for name in ("xlat", "xlong", *values)
+        )
+    )
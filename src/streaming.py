@@ -0,0 +1,133 @@
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import polars as pl
+
+from .impingement import ImpingementAccumulator
+from .instrumentation import stage
+from .turbines import TURBINES
+from .weather import iter_weather_data
+
+STATE_FILE = "state.json"
+
+
+def _site_result(site_dir: Path) -> pl.LazyFrame:
+    parts = sorted(site_dir.glob("part-*.arrow"))
+    return pl.scan_ipc(parts) if parts else pl.LazyFrame()
+
+
+def stream_site(
+    path: str | Path,
+    output: str | Path,
+    turbine: dict,
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+    height: float = 150.0,
+    chunk_size: int = 24 * 365,
+) -> pl.LazyFrame:
+    """Calculate the impingement of one site chunk by chunk, writing as it goes.
+
+    Each chunk of ``chunk_size`` hours is read from the ingestion cache, evaluated for
+    all caps with an ``ImpingementAccumulator`` that carries the cumulative sums, and
+    written to ``output`` as an Arrow IPC part before the next one is read. Memory
+    therefore depends on ``chunk_size`` and the number of caps, not on the length of
+    the archive. The accumulator state is saved after every part, so an interrupted
+    run continues where it stopped.
+
+    Args:
+        path (str | Path): Weather CSV file, see ``src.weather.SCHEMA``.
+        output (str | Path): Directory for the parts and the state of this site.
+        turbine (dict): Turbine definition, see ``src.turbines.TURBINES``.
+        tip_speed_caps (Sequence[float]): Maximum tip speeds (m/s) during rain.
+        coating (str): Blade coating, see ``src.erosion.COATINGS``.
+        height (float): Height above ground (m) of the weather variables.
+        chunk_size (int): Number of hours per chunk.
+
+    Returns:
+        pl.LazyFrame: A scan over the parts with columns ``time``, ``tip_speed_cap``,
+        ``r_impg_acc_sum`` and ``lossvector`` (%).
+
+    Raises:
+        ValueError: If ``output`` holds results for another turbine, other caps or
+            another coating.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    state = output / STATE_FILE
+    if state.exists():
+        accumulator = ImpingementAccumulator.load(state, turbine)
+        if accumulator.coating != coating or not np.array_equal(
+            accumulator.tip_speed_caps, np.atleast_1d(tip_speed_caps)
+        ):
+            raise ValueError(
+                f"{output} holds results for other caps or another coating."
+            )
+    else:
+        accumulator = ImpingementAccumulator(turbine, tip_speed_caps, coating)
+    caps = accumulator.tip_speed_caps
+
+    for chunk in iter_weather_data(
+        path, chunk_size, accumulator.rows, ("wind_speed", "rain"), height
+    ):
+        with stage("streaming.chunk") as running:
+            part = output / f"part-{accumulator.rows:012d}.arrow"
+            time = chunk["time"].to_numpy()
+            kept = time[accumulator.new_rows(time)]
+            sweep = accumulator.update(
+                chunk["wind_speed"].to_numpy(), chunk["rain"].to_numpy(), time
+            )
+            hours = len(kept)
+            partial = part.with_suffix(".tmp")
+            pl.DataFrame(
+                {
+                    "time": np.repeat(kept, len(caps)),
+                    "tip_speed_cap": np.tile(caps, hours),
+                    "r_impg_acc_sum": sweep.r_impg_acc_sum.ravel(),
+                    "lossvector": sweep.lossvector.ravel().astype(np.float32),
+                }
+            ).write_ipc(partial)
+            partial.replace(part)
+            accumulator.save(state)
+            running.rows = hours
+
+    return _site_result(output)
+
+
+def stream_impingement(
+    archives: dict[str, str | Path],
+    output: str | Path,
+    turbine: str,
+    tip_speed_caps: Sequence[float],
+    coating: str = "GS",
+    height: float = 150.0,
+    chunk_size: int = 24 * 365,
+) -> pl.LazyFrame:
+    """Calculate the impingement of many sites in bounded memory, see ``stream_site``.
+
+    Sites are processed one after another into ``output/<site>``.
+
+    Args:
+        archives (dict[str, str | Path]): Weather CSV file of each site.
+        output (str | Path): Directory for the results.
+        turbine (str): Turbine name, see ``src.turbines.TURBINES``.
+
+    Returns:
+        pl.LazyFrame: A scan over the results of all sites, with the columns of
+        ``stream_site`` and ``site``.
+    """
+    output = Path(output)
+    results = []
+    for site, path in archives.items():
+        result = stream_site(
+            path,
+            output / site,
+            TURBINES[turbine],
+            tip_speed_caps,
+            coating,
+            height,
+            chunk_size,
+        )
+        if result.collect_schema().names():
+            results.append(result.with_columns(site=pl.lit(site)))
+    return pl.concat(results) if results else pl.LazyFrame()
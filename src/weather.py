@@ -1,5 +1,11 @@
+from datetime import datetime
+from typing import Iterator, Sequence
+
 import polars as pl
 
+from .cache import scan_csv
+from .instrumentation import instrument
+
 SCHEMA = {
     "timestamp": pl.Datetime("ms"),
     "rainc": pl.Float32,
@@ -11,25 +17,77 @@ SCHEMA = {
     "wsp_150.0": pl.Float32,
 }
 
+COLUMNS = {
+    "wind_speed": "wsp",
+    "rain": "qrain",
+    "air_density": "rho",
+}
+"""Output column names and the ``SCHEMA`` variables they are read from."""
 
-def read_weather_data(path: str) -> pl.LazyFrame:
+
+@instrument
+def read_weather_data(
+    path: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    columns: Sequence[str] = ("wind_speed",),
+    height: float = 150.0,
+) -> pl.LazyFrame:
     """Read weather data.
 
-    See ``SCHEMA`` variable for the expected CSV structure.
+    See ``SCHEMA`` variable for the expected CSV structure. The time window and column
+    selection are applied directly on the scan, so only what is requested is
+    materialised.
+
+    Args:
+        path (str): Weather CSV file.
+        start (datetime | None): First time to include.
+        end (datetime | None): Time to stop before.
+        columns (Sequence[str]): Columns to read, see ``COLUMNS``.
+        height (float): Height above ground (m) of the variables.
 
     Returns:
-        pl.LazyFrame: A lazy frame with columns ``time`` and ``wind_speed``.
+        pl.LazyFrame: A lazy frame with columns ``time`` and ``columns``,
+        ``time`` and ``wind_speed`` by default.
     """
-    data = (
-        pl.read_csv(path, schema=SCHEMA)
-        .lazy()
-        .select(
-            [
-                pl.col("timestamp").alias("time"),
-                pl.col("wsp_150.0").alias("wind_speed"),
-            ]
-        )
-        .set_sorted(pl.col("time"))
-    )
+    data = scan_csv(path, schema=SCHEMA)
+    if start is not None:
+        data = data.filter(pl.col("timestamp") >= start)
+    if end is not None:
+        data = data.filter(pl.col("timestamp") < end)
+    data = data.select(
+        [
+            pl.col("timestamp").alias("time"),
+            *(
+                pl.col(f"{COLUMNS[name]}_{float(height)}").alias(name)
+                for name in columns
+            ),
+        ]
+    ).set_sorted("time")
 
     return data
+
+
+def iter_weather_data(
+    path: str,
+    chunk_size: int = 24 * 365,
+    offset: int = 0,
+    columns: Sequence[str] = ("wind_speed",),
+    height: float = 150.0,
+) -> Iterator[pl.DataFrame]:
+    """Read weather data in chunks of at most ``chunk_size`` rows.
+
+    Each chunk is sliced from the cached scan of ``read_weather_data``, so only one
+    chunk is in memory at a time, whatever the size of the file.
+
+    Args:
+        path (str): Weather CSV file.
+        chunk_size (int): Number of rows per chunk.
+        offset (int): Number of rows to skip, e.g. to resume.
+        columns (Sequence[str]): Columns to read, see ``COLUMNS``.
+        height (float): Height above ground (m) of the variables.
+    """
+    data = read_weather_data(path, columns=columns, height=height)
+    while len(chunk := data.slice(offset, chunk_size).collect()):
+        yield chunk
+        offset += chunk_size
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+
+from src.data_aggregation import join_data
+from src.turbines import TURBINES
+
+
+def test_repeated_local_hour_gives_one_row():
+    start = datetime(2015, 10, 25)
+    time = pl.datetime_range(start, start + timedelta(hours=3), "1h", eager=True)
+    weather = pl.LazyFrame({"time": time, "wind_speed": [8.0, 9.0, 10.0, 11.0]})
+    # Local time repeats 01:00 when daylight saving time ends.
+    prices = pl.LazyFrame(
+        {
+            "time": [*time, datetime(2015, 10, 25, 1)],
+            "price": [10.0, 20.0, 30.0, 40.0, 60.0],
+        }
+    )
+
+    data = join_data(weather, prices, TURBINES["IEA 3.4 130"]).collect()
+
+    assert data["time"].to_list() == time.to_list()
+    assert data["price"].to_list() == [10.0, 40.0, 30.0, 40.0]
@@ -0,0 +1,84 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from benchmarks import synthetic
+from src import impingement
+from src.impingement import (
+    ImpingementAccumulator,
+    calculate_impingement,
+    compact_impingement,
+)
+from src.turbines import TURBINES
+
+TURBINE = TURBINES["IEA 15 240"]
+CAP = 80.0
+
+
+@pytest.fixture
+def windfarm(tmp_path, monkeypatch):
+    path = synthetic.weather_csv(tmp_path / "weather.csv", 1)
+    monkeypatch.setitem(impingement.WINDFARM_FILES, "e2", path)
+    return "e2"
+
+
+def _overlapping(chunks, overlap):
+    # Every chunk starts with the last rows of the one before it.
+    previous = None
+    for chunk in chunks:
+        yield chunk if previous is None else pl.concat([previous[-overlap:], chunk])
+        previous = chunk
+
+
+def test_accumulator_in_overlapping_chunks_matches_one_pass(windfarm, tmp_path):
+    expected = calculate_impingement(TURBINE, windfarm, CAP)[0]
+    chunks = list(_overlapping(impingement.iter_climate_data(windfarm, 1000), 24))
+    checkpoint = tmp_path / "state.json"
+
+    accumulator = ImpingementAccumulator(TURBINE, [CAP])
+    sweeps = list(accumulator.consume(chunks[:4]))
+    accumulator.save(checkpoint)
+    # A restart repeats the last chunk, which adds nothing.
+    accumulator = ImpingementAccumulator.load(checkpoint, TURBINE)
+    sweeps += list(accumulator.consume(chunks[3:]))
+
+    assert accumulator.rows == len(expected)
+    assert accumulator.last_timestamp == expected["time"][-1]
+    np.testing.assert_array_equal(
+        np.concatenate([sweep.r_impg_acc_sum[:, 0] for sweep in sweeps]),
+        expected["r_impg_acc_sum"],
+    )
+    np.testing.assert_allclose(
+        np.concatenate([sweep.lossvector[:, 0] for sweep in sweeps]),
+        expected["lossvector"],
+    )
+
+
+def test_rows_at_or_before_the_last_timestamp_are_skipped():
+    accumulator = ImpingementAccumulator(TURBINE, [CAP])
+    time = np.arange(4).astype("datetime64[h]")
+    accumulator.update(np.full(4, 10.0), np.ones(4), time)
+
+    sweep = accumulator.update(np.full(4, 10.0), np.ones(4), time + 2)
+
+    assert len(sweep.r_impg_acc_sum) == 2
+    assert accumulator.rows == 6
+    assert accumulator.last_timestamp == time[-1] + 2
+
+
+def test_compact_impingement_matches_calculate_impingement(windfarm):
+    expected = calculate_impingement(TURBINE, windfarm, CAP)[0]
+
+    result = compact_impingement(
+        TURBINE, windfarm, CAP, intermediates=True, block_size=1000
+    )
+
+    np.testing.assert_array_equal(result.timestamp, expected["time"].to_numpy())
+    assert result.r_impg_acc_sum.dtype == np.float64
+    np.testing.assert_array_equal(result.r_impg_acc_sum, expected["r_impg_acc_sum"])
+    for name in ("n_star", "omega", "omega_capped", "v_max", "r_impg", "lossvector"):
+        values = getattr(result, name)
+        assert values.dtype == np.float32
+        np.testing.assert_allclose(
+            values, expected[name], rtol=np.finfo(np.float32).eps
+        )
@@ -0,0 +1,32 @@
+import numpy as np
+import polars as pl
+
+from src.power_curve import compile_power_curve, power_at_wind_speed
+from src.turbines import TURBINES
+
+TURBINE = TURBINES["IEA 15 240"]
+WIND_SPEED = [np.nan, 2.0, 7.5, 12.0, 30.0]
+
+
+def test_missing_wind_speed_gives_nan():
+    curve = compile_power_curve(TURBINE)
+
+    for values in (curve.get_power(WIND_SPEED), curve.get_rotor_speed(WIND_SPEED)):
+        assert np.isnan(values[0])
+        assert np.isfinite(values[1:]).all()
+    assert np.isnan(curve.get_rotor_speed([np.inf]))
+
+
+def test_missing_wind_speed_gives_null_in_polars():
+    curve = compile_power_curve(TURBINE)
+    data = pl.DataFrame({"wind_speed": WIND_SPEED + [None]}).select(
+        power=power_at_wind_speed(pl.col("wind_speed"), TURBINE),
+        rotor_speed=curve.rotor_speed_table.expr(pl.col("wind_speed")),
+    )
+
+    assert data["power"].is_null().to_list() == [True, False, False, False, False, True]
+    assert data["rotor_speed"].is_null().to_list() == data["power"].is_null().to_list()
+    np.testing.assert_allclose(data["power"][1:5], curve.get_power(WIND_SPEED[1:]))
+    np.testing.assert_allclose(
+        data["rotor_speed"][1:5], curve.get_rotor_speed(WIND_SPEED[1:])
+    )
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from src.energy_yield import energy_yield
+from src.market import read_price_data
+from src.response_surface import response_surface
+from src.turbines import TURBINES
+
+PRICE_FILE = Path(__file__).parents[1] / "data" / "price_data" / "Ireland.csv"
+TURBINE = TURBINES["IEA 3.4 130"]
+CAPS = [50.0, 70.0, 90.0]
+
+
+def test_revenue_over_a_daylight_saving_fall_back_day():
+    start = datetime(2015, 10, 24)
+    hours = 72
+    rng = np.random.default_rng(0)
+    weather = pl.DataFrame(
+        {
+            "time": pl.datetime_range(
+                start,
+                start + timedelta(hours=hours - 1),
+                "1h",
+                time_unit="ms",
+                eager=True,
+            ),
+            "wind_speed": rng.weibull(2, hours) * 9,
+            "rain": np.where(rng.random(hours) < 0.3, rng.exponential(2, hours), 0),
+        }
+    )
+    price_data = read_price_data(PRICE_FILE, start, start + timedelta(hours=hours))
+    # The local hour 01:00 is repeated when daylight saving time ends.
+    assert price_data.collect().height == hours + 1
+
+    surface = response_surface(TURBINE, weather, CAPS, price_data=price_data)
+
+    price = (
+        weather.join(
+            price_data.collect().group_by("time").agg(pl.col("price").mean()),
+            on="time",
+            how="left",
+            maintain_order="left",
+        )["price"]
+        .cast(pl.Float64)
+        .to_numpy()
+    )
+    assert len(price) == len(weather)
+    expected = energy_yield(
+        TURBINE,
+        weather["wind_speed"].to_numpy(),
+        weather["rain"].to_numpy(),
+        CAPS,
+        price=price,
+    )
+    np.testing.assert_allclose(surface["revenue"], expected.revenue)
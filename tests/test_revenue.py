@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+
+from src.energy_yield import energy_yield
+from src.revenue import revenue, total_revenue
+from src.turbines import TURBINES
+
+TURBINE = TURBINES["IEA 3.4 130"]
+CAPS = [50.0, 70.0, 90.0]
+
+
+def _weather(hours: int = 72) -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame(
+        {
+            "time": pl.datetime_range(
+                datetime(2015, 10, 24),
+                datetime(2015, 10, 24) + timedelta(hours=hours - 1),
+                "1h",
+                eager=True,
+            ),
+            "wind_speed": rng.weibull(2, hours) * 9,
+            "rain": np.where(rng.random(hours) < 0.3, rng.exponential(2, hours), 0),
+        }
+    )
+
+
+def _prices(weather: pl.DataFrame) -> pl.DataFrame:
+    prices = weather.select("time", price=pl.int_range(pl.len()).cast(pl.Float64))
+    # Local time repeats 01:00 when daylight saving time ends.
+    repeated = prices.filter(pl.col("time") == datetime(2015, 10, 25, 1))
+    return pl.concat([prices, repeated.with_columns(pl.col("price") + 10)])
+
+
+def test_total_revenue_matches_energy_yield_across_dst_and_shuffled_rows():
+    weather = _weather()
+    prices = _prices(weather)
+    expected_price = weather.join(
+        prices.group_by("time").agg(pl.col("price").mean()), on="time", how="left"
+    )["price"].to_numpy()
+    expected = energy_yield(
+        TURBINE,
+        weather["wind_speed"].to_numpy(),
+        weather["rain"].to_numpy(),
+        CAPS,
+        price=expected_price,
+    )
+
+    totals = total_revenue(
+        revenue(
+            weather.sample(fraction=1, shuffle=True, seed=1).lazy(),
+            prices.sample(fraction=1, shuffle=True, seed=2).lazy(),
+            {"IEA 3.4 130": TURBINE},
+            CAPS,
+        )
+    ).collect()
+
+    np.testing.assert_allclose(totals["income"], expected.revenue)
+    np.testing.assert_allclose(totals["efficiency"], expected.efficiency)
+    np.testing.assert_allclose(totals["energy_yield"], expected.energy_yield)
@@ -0,0 +1,63 @@
+import geopandas as gpd
+import numpy as np
+import polars as pl
+import pytest
+import shapely
+
+from src.geometry import WindfarmGeometries
+from src.spatial_join import farm_cells, grid_cells
+
+
+def _grid(rows: int = 12, columns: int = 8) -> pl.LazyFrame:
+    # Sheared like the climate grid: further apart in longitude than in latitude.
+    row, column = np.meshgrid(np.arange(rows), np.arange(columns), indexing="ij")
+    return pl.LazyFrame(
+        {
+            "xlat": (55 + row * 0.027 + column * 0.0031).ravel(),
+            "xlong": (5 + row * 0.0057 + column * 0.0499).ravel(),
+        }
+    )
+
+
+def test_grid_cells_tile_the_grid_without_gaps():
+    points = _grid().collect()
+    points = shapely.points(points["xlong"].to_numpy(), points["xlat"].to_numpy())
+    cells = grid_cells(points)
+
+    assert shapely.contains(cells, points).all()
+    covered = shapely.union_all(cells)
+    assert np.isclose(shapely.area(cells).sum(), covered.area)
+    assert shapely.get_num_geometries(covered) == 1
+    assert covered.contains(shapely.convex_hull(shapely.multipoints(points)))
+
+
+def test_farm_between_grid_columns_is_weighted_by_area(tmp_path):
+    # A farm straddling the middle between two columns of grid points.
+    farm = shapely.box(5.15, 55.13, 5.19, 55.16)
+    path = tmp_path / "farms.json"
+    gpd.GeoDataFrame({"name": ["Gap"]}, geometry=[farm], crs="EPSG:4326").to_file(path)
+    grid = _grid()
+
+    cells = farm_cells(grid, WindfarmGeometries([path]))
+
+    points = grid.collect()
+    points = shapely.points(points["xlong"].to_numpy(), points["xlat"].to_numpy())
+    overlap = shapely.area(shapely.intersection(grid_cells(points), farm))
+    assert len(cells) == np.count_nonzero(overlap) > 1
+    assert np.isclose(cells["weight"].sum(), 1)
+    assert np.isclose(overlap.sum(), farm.area)
+
+
+def test_farms_far_from_the_grid_are_left_out(tmp_path):
+    # Just below the southern edge of the grid, and in the Baltic Sea like E2.
+    near = shapely.box(5.0, 54.95, 5.01, 54.96)
+    far = shapely.box(20.5, 56.9, 20.6, 57.0)
+    path = tmp_path / "farms.json"
+    gpd.GeoDataFrame(
+        {"name": ["Near", "Far"]}, geometry=[near, far], crs="EPSG:4326"
+    ).to_file(path)
+
+    with pytest.warns(UserWarning, match="left out: Far"):
+        cells = farm_cells(_grid(), WindfarmGeometries([path]))
+
+    assert cells.rows() == [("Near", 55.0, 5.0, 1.0)]
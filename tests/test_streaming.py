@@ -0,0 +1,89 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from benchmarks import synthetic
+from src import impingement, streaming
+from src.impingement import compact_impingement
+from src.streaming import stream_site
+from src.turbines import TURBINES
+
+TURBINE = TURBINES["IEA 15 240"]
+CAPS = [60.0, 80.0]
+
+
+def _sorted(result: pl.LazyFrame) -> pl.DataFrame:
+    return result.collect().sort("time", "tip_speed_cap")
+
+
+def test_resume_with_another_turbine_is_rejected(tmp_path):
+    path = synthetic.weather_csv(tmp_path / "weather.csv", 1)
+    output = tmp_path / "site"
+    first = stream_site(path, output, TURBINES["IEA 15 240"], CAPS).collect()
+
+    assert (
+        stream_site(path, output, TURBINES["IEA 15 240"], CAPS).collect().equals(first)
+    )
+    with pytest.raises(ValueError, match="another turbine"):
+        stream_site(path, output, TURBINES["IEA 3.4 130"], CAPS)
+
+
+def test_stream_site_matches_compact_impingement(tmp_path, monkeypatch):
+    path = synthetic.weather_csv(tmp_path / "weather.csv", 1)
+    monkeypatch.setitem(impingement.WINDFARM_FILES, "e2", path)
+    expected = compact_impingement(TURBINE, "e2", CAPS)
+
+    result = _sorted(
+        stream_site(path, tmp_path / "site", TURBINE, CAPS, chunk_size=1000)
+    )
+
+    np.testing.assert_array_equal(
+        result["time"].to_numpy(), np.repeat(expected.timestamp, len(CAPS))
+    )
+    np.testing.assert_array_equal(
+        result["tip_speed_cap"], np.tile(CAPS, len(expected.timestamp))
+    )
+    np.testing.assert_array_equal(
+        result["r_impg_acc_sum"], expected.r_impg_acc_sum.ravel()
+    )
+    np.testing.assert_array_equal(result["lossvector"], expected.lossvector.ravel())
+
+
+def test_interrupted_run_resumes_to_the_same_result(tmp_path, monkeypatch):
+    path = synthetic.weather_csv(tmp_path / "weather.csv", 1)
+    expected = _sorted(
+        stream_site(path, tmp_path / "once", TURBINE, CAPS, chunk_size=1000)
+    )
+    read = streaming.iter_weather_data
+
+    def interrupted(*args):
+        chunks = read(*args)
+        for _ in range(3):
+            yield next(chunks)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(streaming, "iter_weather_data", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        stream_site(path, tmp_path / "resumed", TURBINE, CAPS, chunk_size=1000)
+    assert len(list((tmp_path / "resumed").glob("part-*.arrow"))) == 3
+    monkeypatch.undo()
+    result = _sorted(
+        stream_site(path, tmp_path / "resumed", TURBINE, CAPS, chunk_size=1000)
+    )
+
+    assert result.equals(expected)
+
+
+def test_rows_skipped_within_a_chunk_keep_the_times_aligned(tmp_path):
+    path = synthetic.weather_csv(tmp_path / "weather.csv", 1)
+    data = pl.read_csv(path)
+    # An hour of the first chunk repeated in the middle of the second.
+    pl.concat([data[:1500], data[5:6], data[1500:]]).write_csv(path)
+
+    result = stream_site(
+        path, tmp_path / "site", TURBINE, CAPS, chunk_size=1000
+    ).collect()
+
+    assert result["time"].is_sorted()
+    assert result["time"].n_unique() == len(data)
+    assert result.height == len(data) * len(CAPS)
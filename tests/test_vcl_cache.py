@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tools-main"))
+
+from VCL_cache import MANIFEST, QueryCache, request_key  # noqa: E402
+
+REQUEST = {
+    "latitude": 56,
+    "longitude": 8,
+    "vars4D": ["wsp", "wdir"],
+    "heights": [100, 150],
+}
+
+
+def test_request_key_ignores_key_order_variable_order_and_number_type():
+    key = request_key("timeseriesquery", REQUEST)
+
+    assert key == request_key("timeseriesquery", dict(reversed(REQUEST.items())))
+    assert key == request_key("timeseriesquery", {**REQUEST, "vars4D": ["wdir", "wsp"]})
+    assert key == request_key("timeseriesquery", {**REQUEST, "latitude": 56.0})
+
+
+def test_request_key_keeps_what_changes_the_result():
+    key = request_key("timeseriesquery", REQUEST)
+
+    # Heights are matched to columns by position, so their order matters.
+    assert key != request_key("timeseriesquery", {**REQUEST, "heights": [150, 100]})
+    assert key != request_key("timeseriesquery", {**REQUEST, "latitude": 57})
+    assert key != request_key("aggregationquery", REQUEST)
+
+
+def _entry(cache, key, size, used):
+    cache.path(key).mkdir(parents=True)
+    (cache.path(key) / "page-000001.arrow").write_bytes(b"x" * size)
+    cache.commit(key, "timeseriesquery", REQUEST)
+    os.utime(cache.path(key) / MANIFEST, (used, used))
+
+
+def test_evict_removes_least_recently_used_entries_above_max_bytes(tmp_path):
+    cache = QueryCache(tmp_path, max_bytes=2500)
+    now = time.time()
+    for age, key in enumerate(["new", "middle", "old"]):
+        _entry(cache, key, 1000, now - age)
+
+    cache.evict()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["middle", "new"]
+
+
+def test_evict_removes_expired_entries_and_spares_the_kept_one(tmp_path):
+    cache = QueryCache(tmp_path, max_bytes=1500, max_age=60)
+    now = time.time()
+    _entry(cache, "expired", 10, now)
+    manifest = cache.path("expired") / MANIFEST
+    manifest.write_text(json.dumps({"created": now - 120}))
+    _entry(cache, "recent", 1000, now)
+    _entry(cache, "large", 2000, now - 10)
+
+    cache.evict(keep="large")
+
+    assert [path.name for path in tmp_path.iterdir()] == ["large"]
+
+
+def test_get_scans_the_cached_pages(tmp_path):
+    cache = QueryCache(tmp_path)
+    key = request_key("timeseriesquery", REQUEST)
+    cache.path(key).mkdir()
+    pl.DataFrame({"wsp": [1.0, 2.0]}).write_ipc(cache.path(key) / "page-000001.arrow")
+
+    assert cache.get(key) is None
+    cache.commit(key, "timeseriesquery", REQUEST)
+    assert cache.get(key).collect()["wsp"].to_list() == [1.0, 2.0]
@@ -0,0 +1,119 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tools-main"))
+
+from VCL_cache import QueryCache  # noqa: E402
+from VCL_client import QueryFailedError, VCLClient  # noqa: E402
+
+RECORDS = [
+    {"time": f"2020-01-01T{hour:02d}:00", "wsp": float(hour)} for hour in range(7)
+]
+
+
+class StubAPI:
+    """A local stand-in for the VCL API serving ``RECORDS`` as one query."""
+
+    def __init__(self, statuses=("queued", "running", "succeeded"), page_count=True):
+        self.statuses = list(statuses)
+        self.page_count = page_count
+        self.submitted = []
+        self.status_calls = 0
+        self.pages = []
+        self.app = web.Application()
+        self.app.router.add_post("/timeseriesquery", self.submit)
+        self.app.router.add_get("/querystatus/{query_id}", self.status)
+        self.app.router.add_get("/queryresult/{query_id}/{size}/{page}", self.result)
+
+    async def submit(self, request):
+        self.submitted.append((request.headers["api_key"], await request.json()))
+        return web.json_response({"queryId": "q1"})
+
+    async def status(self, request):
+        status = self.statuses[min(self.status_calls, len(self.statuses) - 1)]
+        self.status_calls += 1
+        return web.json_response({"status": status})
+
+    async def result(self, request):
+        size, page = int(request.match_info["size"]), int(request.match_info["page"])
+        self.pages.append(page)
+        body = {"data": RECORDS[(page - 1) * size : page * size]}
+        if self.page_count:
+            body["totalRecords"] = len(RECORDS)
+        return web.json_response(body)
+
+
+def _fetch(api, directory, **kwargs):
+    async def run():
+        async with TestServer(api.app) as server:
+            async with VCLClient(
+                "key", str(server.make_url("")), poll_interval=0.01, **kwargs
+            ) as client:
+                query_id = await client.timeseries_query(
+                    56, 8, "2020-01-01", "2020-01-02", ["wsp"], [], [150]
+                )
+                return query_id, (await client.fetch(query_id, directory)).collect()
+
+    return asyncio.run(run())
+
+
+def test_submit_wait_and_download_all_pages(tmp_path):
+    api = StubAPI()
+    query_id, data = _fetch(api, tmp_path, records_per_page=3)
+
+    assert query_id == "q1"
+    assert api.submitted[0][0] == "key"
+    assert api.status_calls == 3
+    assert sorted(api.pages) == [1, 2, 3]
+    assert data.to_dicts() == RECORDS
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_pages_without_page_count_stop_at_first_empty_page(tmp_path):
+    api = StubAPI(page_count=False)
+    _, data = _fetch(api, tmp_path, records_per_page=2, concurrency=2)
+
+    assert data.to_dicts() == RECORDS
+    assert max(api.pages) == 5
+
+
+def test_downloaded_pages_are_not_fetched_again(tmp_path):
+    _fetch(StubAPI(), tmp_path, records_per_page=3)
+    (tmp_path / "page-000003.arrow").unlink()
+    (tmp_path / "page-000003.tmp").write_bytes(b"truncated")
+
+    api = StubAPI()
+    _, data = _fetch(api, tmp_path, records_per_page=3)
+
+    assert sorted(api.pages) == [1, 3]
+    assert data.to_dicts() == RECORDS
+
+
+def test_failed_query_raises(tmp_path):
+    with pytest.raises(QueryFailedError):
+        _fetch(StubAPI(statuses=("running", "failed")), tmp_path)
+
+
+def test_cached_result_larger_than_the_cache_is_still_returned(tmp_path):
+    api = StubAPI()
+    cache = QueryCache(tmp_path, max_bytes=1)
+
+    async def run():
+        async with TestServer(api.app) as server:
+            async with VCLClient(
+                "key", str(server.make_url("")), poll_interval=0.01, cache=cache
+            ) as client:
+                request = {"latitude": 56, "longitude": 8, "vars4D": ["wsp"]}
+                first = (await client.run("timeseriesquery", request)).collect()
+                second = (await client.run("timeseriesquery", request)).collect()
+                return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.to_dicts() == second.to_dicts() == RECORDS
+    assert len(api.submitted) == 1
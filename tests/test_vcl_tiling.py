@@ -0,0 +1,151 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "tools-main"))
+
+from VCL_client import QueryFailedError, VCLClient  # noqa: E402
+from VCL_tiling import (  # noqa: E402
+    DATE_FORMAT,
+    Tile,
+    plan_tiles,
+    timeseries_area_query_tiled,
+)
+
+SPACING = 0.25
+AREA = (8.0, 9.0, 55.0, 55.5, "20200101", "20200104")
+
+
+def _records(request):
+    # Grid points on the edge of a box are inside it, so neighbouring tiles share them.
+    start = datetime.strptime(request["starttime"], DATE_FORMAT)
+    end = datetime.strptime(request["endtime"], DATE_FORMAT)
+    days = [start + timedelta(days=day) for day in range((end - start).days + 1)]
+    longitudes = [
+        i * SPACING
+        for i in range(round(request["minxlong"] / SPACING), 1000)
+        if i * SPACING <= request["maxxlong"]
+    ]
+    latitudes = [
+        i * SPACING
+        for i in range(round(request["minxlat"] / SPACING), 1000)
+        if i * SPACING <= request["maxxlat"]
+    ]
+    return [
+        {"time": day.isoformat(), "xlong": x, "xlat": y, "wsp": x * y + day.day}
+        for day in days
+        for x in longitudes
+        for y in latitudes
+    ]
+
+
+class StubAreaAPI:
+    """A local stand-in for the VCL API answering timeseries area queries."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.queries = []
+        self.app = web.Application()
+        self.app.router.add_post("/timeseriesareaquery", self.submit)
+        self.app.router.add_get("/querystatus/{query_id}", self.status)
+        self.app.router.add_get("/queryresult/{query_id}/{size}/{page}", self.result)
+
+    def _query(self, request):
+        return self.queries[int(request.match_info["query_id"])]
+
+    async def submit(self, request):
+        self.queries.append(await request.json())
+        return web.json_response({"queryId": str(len(self.queries) - 1)})
+
+    async def status(self, request):
+        query = self._query(request)
+        failed = (query["minxlong"], query["starttime"]) in self.failing
+        return web.json_response({"status": "failed" if failed else "succeeded"})
+
+    async def result(self, request):
+        size, page = int(request.match_info["size"]), int(request.match_info["page"])
+        records = _records(self._query(request))
+        return web.json_response(
+            {
+                "data": records[(page - 1) * size : page * size],
+                "totalRecords": len(records),
+            }
+        )
+
+
+def _run(api, directory, **kwargs):
+    async def run():
+        async with TestServer(api.app) as server:
+            async with VCLClient(
+                "key", str(server.make_url("")), poll_interval=0.01, records_per_page=7
+            ) as client:
+                result = await timeseries_area_query_tiled(
+                    client, *AREA, ["wsp"], [], [150], directory, **kwargs
+                )
+                return result.collect()
+
+    return asyncio.run(run())
+
+
+def test_plan_tiles_covers_uneven_areas_and_date_ranges():
+    tiles = plan_tiles(8, 9.2, 55, 55.3, "20200130", "20200302", 0.5, 14)
+
+    longitudes = sorted({(tile.min_longitude, tile.max_longitude) for tile in tiles})
+    latitudes = sorted({(tile.min_latitude, tile.max_latitude) for tile in tiles})
+    dates = sorted({(tile.start_date, tile.end_date) for tile in tiles})
+    assert len(tiles) == len(longitudes) * len(latitudes) * len(dates) == 9
+    assert [edge for tile in longitudes for edge in tile] == pytest.approx(
+        [8, 8.4, 8.4, 8.8, 8.8, 9.2]
+    )
+    assert latitudes == [(55, 55.3)]
+    # 2020 is a leap year: 33 days in chunks of 14, 14 and 5.
+    assert dates == [
+        ("20200130", "20200212"),
+        ("20200213", "20200226"),
+        ("20200227", "20200302"),
+    ]
+
+
+def test_plan_tiles_without_chunks_keeps_the_date_range():
+    assert plan_tiles(8, 8.3, 55, 55.3, "20200101", "20201231") == [
+        Tile(8, 8.3, 55, 55.3, "20200101", "20201231")
+    ]
+
+
+def test_rows_on_shared_tile_edges_are_kept_once(tmp_path):
+    api = StubAreaAPI()
+    data = _run(api, tmp_path, days_per_chunk=2)
+
+    assert len(api.queries) == 2 * 1 * 2
+    expected = _records(
+        {
+            "minxlong": AREA[0],
+            "maxxlong": AREA[1],
+            "minxlat": AREA[2],
+            "maxxlat": AREA[3],
+            "starttime": AREA[4],
+            "endtime": AREA[5],
+        }
+    )
+    assert data.height == len(expected)
+    assert sorted(data.rows()) == sorted(tuple(row.values()) for row in expected)
+
+
+def test_rerun_after_a_failed_tile_only_fetches_that_tile(tmp_path):
+    failing = StubAreaAPI(failing=[(8.5, "20200103")])
+    with pytest.raises(QueryFailedError):
+        _run(failing, tmp_path, days_per_chunk=2, max_tiles=1, retries=0)
+    assert len(failing.queries) == 4
+
+    api = StubAreaAPI()
+    data = _run(api, tmp_path, days_per_chunk=2)
+
+    assert [(query["minxlong"], query["starttime"]) for query in api.queries] == [
+        (8.5, "20200103")
+    ]
+    assert data.height == 5 * 3 * 4
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+import polars as pl
+
+CACHE_DIR = Path(__file__).parent / ".vcl_cache"
+MANIFEST = "request.json"
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_canonical(item) for item in value]
+        # The order of variable names does not change the result.
+        return sorted(items) if all(isinstance(item, str) for item in items) else items
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def request_key(endpoint, request):
+    """
+    Computes the cache key of a query.
+
+    The key is a hash of the endpoint and the canonical form of the request body, so
+    requests that only differ in key order, ``10`` versus ``10.0`` or the order of
+    variable names share a key.
+
+    Args:
+      endpoint (str): The query endpoint, e.g. "timeseriesquery".
+      request (dict): The request body.
+
+    Returns:
+      str: The hexadecimal key.
+    """
+    canonical = json.dumps(
+        {"endpoint": endpoint, "request": _canonical(request)},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class QueryCache:
+    """
+    On-disk cache of decoded query results.
+
+    Each entry is a directory named by ``request_key`` holding the result pages as Arrow
+    IPC files, and a manifest with the request that marks the entry as complete.
+
+    Args:
+      directory (str | Path): The cache directory.
+      max_bytes (int): The total size above which the least recently used entries are
+        evicted.
+      max_age (float): The age in seconds after which entries are evicted.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=10 * 1024**3, max_age=30 * 86400):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def path(self, key):
+        """Returns the directory of an entry."""
+        return self.directory / key
+
+    def get(self, key):
+        """
+        Looks up a complete, unexpired entry.
+
+        Returns:
+          pl.LazyFrame: A scan over the cached result, or None on a miss.
+        """
+        manifest = self.path(key) / MANIFEST
+        if not manifest.exists():
+            return None
+        if time.time() - json.loads(manifest.read_text())["created"] > self.max_age:
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            return None
+        manifest.touch()
+        pages = sorted(self.path(key).glob("*.arrow"))
+        return pl.scan_ipc(pages) if pages else pl.LazyFrame()
+
+    def commit(self, key, endpoint, request):
+        """Marks the entry as complete once all its pages are written."""
+        manifest = {"endpoint": endpoint, "request": request, "created": time.time()}
+        (self.path(key) / MANIFEST).write_text(json.dumps(manifest))
+
+    def evict(self, keep=None):
+        """
+        Removes expired entries, then the least recently used ones above ``max_bytes``.
+
+        Args:
+          keep (str): The key of an entry that is never evicted, e.g. the one just
+            committed, even if it alone exceeds ``max_bytes``.
+        """
+        entries = []
+        for entry in self.directory.glob("*"):
+            manifest = entry / MANIFEST
+            if not manifest.exists():
+                continue
+            created = json.loads(manifest.read_text())["created"]
+            if time.time() - created > self.max_age and entry.name != keep:
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            size = sum(path.stat().st_size for path in entry.iterdir())
+            entries.append((manifest.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Removes every entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,282 @@
+import asyncio
+import math
+from pathlib import Path
+
+import aiohttp
+import polars as pl
+
+from VCL_cache import request_key
+from VCL_query_aggregation import aggregation_request
+from VCL_query_threshold import threshold_request
+from VCL_query_timeseries import timeseries_request
+from VCL_query_timeseries_area import timeseries_area_request
+
+API_URL = "https://public-test.api.vestas.com/public/vestas-climate-library/v1"
+FINISHED_STATUSES = {"succeeded", "completed", "finished", "done"}
+FAILED_STATUSES = {"failed", "cancelled", "canceled", "error"}
+
+
+class QueryFailedError(RuntimeError):
+    """Raised when the API reports a query as failed."""
+
+
+def _query_id(response):
+    if isinstance(response, str):
+        return response
+    for key in ("queryId", "queryID", "id"):
+        if key in response:
+            return response[key]
+    raise KeyError(f"No query ID in response: {response}")
+
+
+def _records(page):
+    if isinstance(page, list):
+        return page
+    for key in ("data", "results", "result", "records"):
+        if isinstance(page.get(key), list):
+            return page[key]
+    return []
+
+
+def _page_count(page, records_per_page):
+    if isinstance(page, dict):
+        if "totalPages" in page:
+            return int(page["totalPages"])
+        for key in ("totalRecords", "totalCount"):
+            if key in page:
+                return math.ceil(int(page[key]) / records_per_page)
+    return None
+
+
+def _write_page(path, records):
+    # Written under a temporary name first, so an interrupted download never leaves a
+    # truncated page behind that would be taken for a complete one.
+    if records:
+        partial = path.with_suffix(".tmp")
+        pl.DataFrame(records).write_ipc(partial)
+        partial.replace(path)
+    return bool(records)
+
+
+class VCLClient:
+    """
+    Asynchronous client for the Vestas Climate Library API.
+
+    All requests share one pooled HTTP session. Queries are submitted, their status is
+    polled with exponential backoff and the result pages are downloaded concurrently
+    straight into Arrow IPC files.
+
+    Args:
+      api_key (str): The API key for accessing the Vestas Climate Library API.
+      base_url (str): The API root, e.g. a local stub server for testing.
+      max_connections (int): The size of the connection pool.
+      concurrency (int): The maximum number of result pages fetched at the same time.
+      records_per_page (int): The number of records per result page.
+      poll_interval (float): The initial delay between status polls in seconds.
+      max_poll_interval (float): The maximum delay between status polls in seconds.
+      cache (QueryCache): The cache ``run`` answers repeated requests from, none by
+        default.
+
+    Example:
+      async with VCLClient(api_key) as client:
+          query_id = await client.timeseries_query(45, 10, "2010-01-01", ...)
+          data = await client.fetch(query_id, "result").collect()
+    """
+
+    def __init__(
+        self,
+        api_key,
+        base_url=API_URL,
+        max_connections=8,
+        concurrency=4,
+        records_per_page=500,
+        poll_interval=1.0,
+        max_poll_interval=30.0,
+        cache=None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.concurrency = concurrency
+        self.records_per_page = records_per_page
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.cache = cache
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            headers={"Content-Type": "application/json", "api_key": self.api_key},
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    async def _request(self, method, path, body=None):
+        async with self._session.request(
+            method, f"{self.base_url}/{path}", json=body
+        ) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def submit(self, endpoint, request):
+        """
+        Submits a query.
+
+        Args:
+          endpoint (str): The query endpoint, e.g. "timeseriesquery".
+          request (dict): The request body.
+
+        Returns:
+          str: The ID of the query.
+        """
+        return _query_id(await self._request("POST", endpoint, request))
+
+    async def timeseries_query(self, *args, **kwargs):
+        """Submits a timeseries query, see ``timeseries_request`` for the arguments."""
+        return await self.submit("timeseriesquery", timeseries_request(*args, **kwargs))
+
+    async def timeseries_area_query(self, *args, **kwargs):
+        """Submits a timeseries area query, see ``timeseries_area_request`` for the arguments."""
+        return await self.submit(
+            "timeseriesareaquery", timeseries_area_request(*args, **kwargs)
+        )
+
+    async def aggregation_query(self, *args, **kwargs):
+        """Submits an aggregation query, see ``aggregation_request`` for the arguments."""
+        return await self.submit(
+            "aggregationquery", aggregation_request(*args, **kwargs)
+        )
+
+    async def threshold_query(self, *args, **kwargs):
+        """Submits a threshold query, see ``threshold_request`` for the arguments."""
+        return await self.submit("thresholdquery", threshold_request(*args, **kwargs))
+
+    async def query_status(self, query_id):
+        """
+        Gets the status of a query.
+
+        Returns:
+          dict: The response JSON containing the query status.
+        """
+        return await self._request("GET", f"querystatus/{query_id}")
+
+    async def wait(self, query_id, timeout=None):
+        """
+        Polls the status of a query until it has finished.
+
+        Args:
+          query_id (str): The ID of the query.
+          timeout (float): The maximum time to wait in seconds, unlimited by default.
+
+        Returns:
+          dict: The last status response.
+        """
+        delay = self.poll_interval
+        async with asyncio.timeout(timeout):
+            while True:
+                response = await self.query_status(query_id)
+                status = str(response.get("status", "")).lower()
+                if status in FINISHED_STATUSES:
+                    return response
+                if status in FAILED_STATUSES:
+                    raise QueryFailedError(f"Query {query_id} failed: {response}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_poll_interval)
+
+    async def query_result(self, query_id, page_number):
+        """
+        Gets one page of a query result.
+
+        Returns:
+          dict: The response JSON containing the query result.
+        """
+        return await self._request(
+            "GET", f"queryresult/{query_id}/{self.records_per_page}/{page_number}"
+        )
+
+    async def download(self, query_id, directory):
+        """
+        Downloads all pages of a query result into a directory of Arrow IPC files.
+
+        Pages are fetched concurrently, at most ``concurrency`` at a time, and each page
+        is written to ``page-<number>.arrow`` as soon as it arrives. Pages that are
+        already on disk are not fetched again.
+
+        Args:
+          query_id (str): The ID of a finished query.
+          directory (str | Path): The directory to write to.
+
+        Returns:
+          pl.LazyFrame: A scan over the downloaded pages.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(page_number):
+            path = directory / f"page-{page_number:06d}.arrow"
+            if path.exists():
+                return True
+            async with limit:
+                page = await self.query_result(query_id, page_number)
+            return _write_page(path, _records(page))
+
+        first = await self.query_result(query_id, 1)
+        page_count = _page_count(first, self.records_per_page)
+        _write_page(directory / "page-000001.arrow", _records(first))
+
+        if page_count is not None:
+            await asyncio.gather(*(fetch(n) for n in range(2, page_count + 1)))
+        else:
+            # Without a page count, fetch batches of pages until one comes back empty.
+            next_page = 2
+            while _records(first) and all(
+                await asyncio.gather(
+                    *(fetch(n) for n in range(next_page, next_page + self.concurrency))
+                )
+            ):
+                next_page += self.concurrency
+
+        pages = sorted(directory.glob("page-*.arrow"))
+        return pl.scan_ipc(pages) if pages else pl.LazyFrame()
+
+    async def fetch(self, query_id, directory, timeout=None):
+        """
+        Waits for a query to finish and downloads its result, see ``download``.
+        """
+        await self.wait(query_id, timeout)
+        return await self.download(query_id, directory)
+
+    async def run(self, endpoint, request, directory=None, timeout=None):
+        """
+        Submits a query, waits for it to finish and downloads its result.
+
+        With a ``cache``, a request identical to an earlier one is answered from disk
+        without contacting the API, and new results are stored in the cache.
+
+        Args:
+          endpoint (str): The query endpoint, e.g. "timeseriesquery".
+          request (dict): The request body, see the ``*_request`` functions.
+          directory (str | Path): The directory to download to when there is no cache.
+          timeout (float): The maximum time to wait for the query in seconds.
+
+        Returns:
+          pl.LazyFrame: A scan over the result.
+        """
+        if self.cache is None:
+            query_id = await self.submit(endpoint, request)
+            return await self.fetch(query_id, directory, timeout)
+
+        key = request_key(endpoint, request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        query_id = await self.submit(endpoint, request)
+        await self.fetch(query_id, self.cache.path(key), timeout)
+        self.cache.commit(key, endpoint, request)
+        self.cache.evict(keep=key)
+        return self.cache.get(key)
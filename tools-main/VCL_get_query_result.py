@@ -22,13 +22,14 @@ def get_query_result(query_id, api_key, records_per_page, page_number):
     return response.json()
 
 
-# Example usage
-api_key = "a94iWCzg6W5Aq1J8COyDJd8xa9WB5Ja5"
-query_id = "0f9de2dd-ebb1-4218-bf74-7166215e8225"
-records_per_page = 500
-page_number = 1
+if __name__ == "__main__":
+    # Example usage
+    api_key = "a94iWCzg6W5Aq1J8COyDJd8xa9WB5Ja5"
+    query_id = "0f9de2dd-ebb1-4218-bf74-7166215e8225"
+    records_per_page = 500
+    page_number = 1
 
-query_result = get_query_result(query_id, api_key, records_per_page, page_number)
+    query_result = get_query_result(query_id, api_key, records_per_page, page_number)
 
-print("Query Result: ")
-print(query_result)
+    print("Query Result: ")
+    print(query_result)
@@ -19,10 +19,11 @@ def get_query_status(query_id, api_key):
     return response.json()
 
 
-# Example usage
-api_key = "insert-your-key"
-query_id = "0f9de2dd-ebb1-4218-bf74-7166215e8225"
+if __name__ == "__main__":
+    # Example usage
+    api_key = "insert-your-key"
+    query_id = "0f9de2dd-ebb1-4218-bf74-7166215e8225"
 
-response = get_query_status(query_id, api_key)
-print("Query Status: ")
-print(response)
+    response = get_query_status(query_id, api_key)
+    print("Query Status: ")
+    print(response)
@@ -2,6 +2,41 @@ import requests
 import json
 
 
+def aggregation_request(
+    min_longitude,
+    max_longitude,
+    min_latitude,
+    max_latitude,
+    start_date,
+    end_date,
+    aggregation,
+):
+    """
+    Builds the request body of an aggregation query.
+
+    Args:
+      min_latitude (float): The minimum latitude of the area.
+      max_latitude (float): The maximum latitude of the area.
+      min_longitude (float): The minimum longitude of the area.
+      max_longitude (float): The maximum longitude of the area.
+      start_date (str): The start date of the timeseries data in YYYYMMDD format.
+      end_date (str): The end date of the timeseries data in YYYYMMDD format.
+      aggregation (dict): The aggregation functions and variables to be used in the query.
+
+    Returns:
+      dict: The request body.
+    """
+    return {
+        "minxlat": min_latitude,
+        "maxxlat": max_latitude,
+        "minxlong": min_longitude,
+        "maxxlong": max_longitude,
+        "starttime": start_date,
+        "endtime": end_date,
+        "selectedFunction": aggregation,
+    }
+
+
 def aggregation_query(
     min_longitude,
     max_longitude,
@@ -30,15 +65,15 @@ def aggregation_query(
     """
     api_url = "https://public-test.api.vestas.com/public/vestas-climate-library/v1/aggregationquery"
     headers = {"Content-Type": "application/json", "api_key": api_key}
-    request = {
-        "minxlat": min_latitude,
-        "maxxlat": max_latitude,
-        "minxlong": min_longitude,
-        "maxxlong": max_longitude,
-        "starttime": start_date,
-        "endtime": end_date,
-        "selectedFunction": aggregation,
-    }
+    request = aggregation_request(
+        min_longitude,
+        max_longitude,
+        min_latitude,
+        max_latitude,
+        start_date,
+        end_date,
+        aggregation,
+    )
     response = requests.post(api_url, data=json.dumps(request), headers=headers)
     return response.json()
 
@@ -91,40 +126,41 @@ def construct_aggregation_dict_open(
     return aggregation_dict
 
 
-# Example usage:
-min_longitude = 10
-max_longitude = 10.1
-min_latitude = 45
-max_latitude = 45.1
-start_date = "20220101"
-end_date = "20220131"
-agg_functions = ["AVG", "MAX"]  # , "MIN", "SD"] # At least one function is required
-
-# Here you can either use the construct_aggregation_dict (same variables and heights for all aggregation functions)
-#                          or construct_aggregation_dict_open (different variables and heights for each aggregation function)
-vars_3d = ["hgt", "t2"]
-vars_4d = ["wsp", "tk"]  # Can be empty
-heights = [100, 200]  # Must not be empty if 4D variables are used
-# aggregation = construct_aggregation_dict(agg_functions, vars_3d, vars_4d, heights)
-
-vars_3d_list = [["hgt", "t2"], ["swdown", "tc2"]]
-vars_4d_list = [["wsp", "tk"], ["qvapor", "tc"]]
-heights_list = [[100, 200], [80, 240]]
-aggregation = construct_aggregation_dict_open(
-    agg_functions, vars_3d_list, vars_4d_list, heights_list
-)
-
-api_key = "insert-your-key"
-
-response = aggregation_query(
-    min_longitude,
-    max_longitude,
-    min_latitude,
-    max_latitude,
-    start_date,
-    end_date,
-    aggregation,
-    api_key,
-)
-print("Aggregation Query: ")
-print(response)
+if __name__ == "__main__":
+    # Example usage:
+    min_longitude = 10
+    max_longitude = 10.1
+    min_latitude = 45
+    max_latitude = 45.1
+    start_date = "20220101"
+    end_date = "20220131"
+    agg_functions = ["AVG", "MAX"]  # , "MIN", "SD"] # At least one function is required
+
+    # Here you can either use the construct_aggregation_dict (same variables and heights for all aggregation functions)
+    #                          or construct_aggregation_dict_open (different variables and heights for each aggregation function)
+    vars_3d = ["hgt", "t2"]
+    vars_4d = ["wsp", "tk"]  # Can be empty
+    heights = [100, 200]  # Must not be empty if 4D variables are used
+    # aggregation = construct_aggregation_dict(agg_functions, vars_3d, vars_4d, heights)
+
+    vars_3d_list = [["hgt", "t2"], ["swdown", "tc2"]]
+    vars_4d_list = [["wsp", "tk"], ["qvapor", "tc"]]
+    heights_list = [[100, 200], [80, 240]]
+    aggregation = construct_aggregation_dict_open(
+        agg_functions, vars_3d_list, vars_4d_list, heights_list
+    )
+
+    api_key = "insert-your-key"
+
+    response = aggregation_query(
+        min_longitude,
+        max_longitude,
+        min_latitude,
+        max_latitude,
+        start_date,
+        end_date,
+        aggregation,
+        api_key,
+    )
+    print("Aggregation Query: ")
+    print(response)
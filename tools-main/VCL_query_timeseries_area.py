@@ -2,7 +2,7 @@ import requests
 import json
 
 
-def timeseries_area_query(
+def timeseries_area_request(
     min_longitude,
     max_longitude,
     min_latitude,
@@ -12,29 +12,25 @@ def timeseries_area_query(
     vars_4d,
     vars_3d,
     heights,
-    api_key,
 ):
     """
-    Queries the Vestas Climate Library API for timeseries data.
+    Builds the request body of a timeseries area query.
 
     Args:
       min_latitude (float): The minimum latitude of the area.
       max_latitude (float): The maximum latitude of the area.
       min_longitude (float): The minimum longitude of the area.
       max_longitude (float): The maximum longitude of the area.
-      start_date (str): The start date of the timeseries data in YYYY-MM-DD format.
-      end_date (str): The end date of the timeseries data in YYYY-MM-DD format.
+      start_date (str): The start date of the timeseries data in YYYYMMDD format.
+      end_date (str): The end date of the timeseries data in YYYYMMDD format.
       vars_4d (list): List of 4D variables to query.
       vars_3d (list): List of 3D variables to query.
       heights (list): List of heights above ground to query.
-      api_key (str): The API key for accessing the Vestas Climate Library API.
 
     Returns:
-      dict: The response from the API in JSON format.
+      dict: The request body.
     """
-    api_url = "https://public-test.api.vestas.com/public/vestas-climate-library/v1/timeseriesareaquery"
-    headers = {"Content-Type": "application/json", "api_key": api_key}
-    request = {
+    return {
         "minxlat": min_latitude,
         "maxxlat": max_latitude,
         "minxlong": min_longitude,
@@ -47,23 +43,9 @@ def timeseries_area_query(
             "zHeights": heights,  # Must not be empty if vars_4d is not empty
         },
     }
-    response = requests.post(api_url, data=json.dumps(request), headers=headers)
-    return response.json()
-
 
-# Example usage:
-min_longitude = 10
-max_longitude = 10.1
-min_latitude = 45
-max_latitude = 45.1
-start_date = "20220101"
-end_date = "20220131"
-vars_4d = ["wsp", "wdir", "tk"]  # Can be empty []
-vars_3d = ["swdown", "t2"]
-heights = [80, 240]  # Must not be empty if vars_4d is not empty
-api_key = "insert-your-key"
 
-response = timeseries_area_query(
+def timeseries_area_query(
     min_longitude,
     max_longitude,
     min_latitude,
@@ -74,6 +56,66 @@ response = timeseries_area_query(
     vars_3d,
     heights,
     api_key,
-)
-print("Timeseries Area Query: ")
-print(response)
+):
+    """
+    Queries the Vestas Climate Library API for timeseries data.
+
+    Args:
+      min_latitude (float): The minimum latitude of the area.
+      max_latitude (float): The maximum latitude of the area.
+      min_longitude (float): The minimum longitude of the area.
+      max_longitude (float): The maximum longitude of the area.
+      start_date (str): The start date of the timeseries data in YYYY-MM-DD format.
+      end_date (str): The end date of the timeseries data in YYYY-MM-DD format.
+      vars_4d (list): List of 4D variables to query.
+      vars_3d (list): List of 3D variables to query.
+      heights (list): List of heights above ground to query.
+      api_key (str): The API key for accessing the Vestas Climate Library API.
+
+    Returns:
+      dict: The response from the API in JSON format.
+    """
+    api_url = "https://public-test.api.vestas.com/public/vestas-climate-library/v1/timeseriesareaquery"
+    headers = {"Content-Type": "application/json", "api_key": api_key}
+    request = timeseries_area_request(
+        min_longitude,
+        max_longitude,
+        min_latitude,
+        max_latitude,
+        start_date,
+        end_date,
+        vars_4d,
+        vars_3d,
+        heights,
+    )
+    response = requests.post(api_url, data=json.dumps(request), headers=headers)
+    return response.json()
+
+
+if __name__ == "__main__":
+    # Example usage:
+    min_longitude = 10
+    max_longitude = 10.1
+    min_latitude = 45
+    max_latitude = 45.1
+    start_date = "20220101"
+    end_date = "20220131"
+    vars_4d = ["wsp", "wdir", "tk"]  # Can be empty []
+    vars_3d = ["swdown", "t2"]
+    heights = [80, 240]  # Must not be empty if vars_4d is not empty
+    api_key = "insert-your-key"
+
+    response = timeseries_area_query(
+        min_longitude,
+        max_longitude,
+        min_latitude,
+        max_latitude,
+        start_date,
+        end_date,
+        vars_4d,
+        vars_3d,
+        heights,
+        api_key,
+    )
+    print("Timeseries Area Query: ")
+    print(response)
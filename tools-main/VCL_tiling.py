@@ -0,0 +1,221 @@
+import asyncio
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+import polars as pl
+
+from VCL_query_aggregation import aggregation_request
+from VCL_query_timeseries_area import timeseries_area_request
+
+DATE_FORMAT = "%Y%m%d"
+
+
+class Tile(NamedTuple):
+    """A part of an area query: a bounding box and a date range (both included)."""
+
+    min_longitude: float
+    max_longitude: float
+    min_latitude: float
+    max_latitude: float
+    start_date: str
+    end_date: str
+
+
+def _split(low, high, size):
+    count = max(math.ceil((high - low) / size - 1e-9), 1)
+    edges = [low + (high - low) * i / count for i in range(count + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def plan_tiles(
+    min_longitude,
+    max_longitude,
+    min_latitude,
+    max_latitude,
+    start_date,
+    end_date,
+    tile_size=0.5,
+    days_per_chunk=None,
+):
+    """
+    Splits an area query into spatial tiles and time chunks.
+
+    Args:
+      min_longitude (float): The minimum longitude of the area.
+      max_longitude (float): The maximum longitude of the area.
+      min_latitude (float): The minimum latitude of the area.
+      max_latitude (float): The maximum latitude of the area.
+      start_date (str): The start date in YYYYMMDD format.
+      end_date (str): The end date in YYYYMMDD format.
+      tile_size (float): The maximum width and height of a tile in degrees.
+      days_per_chunk (int): The maximum number of days per chunk, the whole date range
+        if not given.
+
+    Returns:
+      list[Tile]: The tiles, covering the area and date range.
+    """
+    start = datetime.strptime(start_date, DATE_FORMAT)
+    end = datetime.strptime(end_date, DATE_FORMAT)
+    days = (end - start).days + 1
+    step = days if days_per_chunk is None else days_per_chunk
+    chunks = [
+        (
+            (start + timedelta(days=offset)).strftime(DATE_FORMAT),
+            min(start + timedelta(days=offset + step - 1), end).strftime(DATE_FORMAT),
+        )
+        for offset in range(0, days, step)
+    ]
+    return [
+        Tile(*longitudes, *latitudes, *chunk)
+        for longitudes in _split(min_longitude, max_longitude, tile_size)
+        for latitudes in _split(min_latitude, max_latitude, tile_size)
+        for chunk in chunks
+    ]
+
+
+async def _run_tile(client, endpoint, request, directory, retries, timeout):
+    done = directory / ".done"
+    for attempt in range(retries + 1):
+        try:
+            if client.cache is not None:
+                return await client.run(endpoint, request, timeout=timeout)
+            if done.exists():
+                pages = sorted(directory.glob("page-*.arrow"))
+                return pl.scan_ipc(pages) if pages else pl.LazyFrame()
+            result = await client.run(endpoint, request, directory, timeout)
+            done.touch()
+            return result
+        except Exception:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(2**attempt)
+
+
+async def run_tiled(
+    client,
+    endpoint,
+    tiles,
+    build_request,
+    directory,
+    max_tiles=4,
+    retries=3,
+    timeout=None,
+):
+    """
+    Runs the tiles of an area query concurrently and reassembles the result.
+
+    Every tile is downloaded into its own directory (or the client's cache) and marked
+    complete when done, so running the same plan again after a failure only fetches the
+    missing tiles and pages. Rows on shared tile edges are deduplicated.
+
+    Args:
+      client (VCLClient): An open client.
+      endpoint (str): The query endpoint, e.g. "timeseriesareaquery".
+      tiles (list[Tile]): The tiles, see ``plan_tiles``.
+      build_request (Callable[[Tile], dict]): Builds the request body of a tile.
+      directory (str | Path): The directory to download the tiles to.
+      max_tiles (int): The maximum number of tiles queried at the same time.
+      retries (int): The number of times a failed tile is retried.
+      timeout (float): The maximum time to wait for each tile query in seconds.
+
+    Returns:
+      pl.LazyFrame: The combined result.
+    """
+    directory = Path(directory)
+    limit = asyncio.Semaphore(max_tiles)
+
+    async def run(index, tile):
+        async with limit:
+            return await _run_tile(
+                client,
+                endpoint,
+                build_request(tile),
+                directory / f"tile-{index:05d}",
+                retries,
+                timeout,
+            )
+
+    results = await asyncio.gather(*(run(i, tile) for i, tile in enumerate(tiles)))
+    results = [result for result in results if result.collect_schema().names()]
+    if not results:
+        return pl.LazyFrame()
+    return pl.concat(results, how="diagonal_relaxed").unique(maintain_order=True)
+
+
+async def timeseries_area_query_tiled(
+    client,
+    min_longitude,
+    max_longitude,
+    min_latitude,
+    max_latitude,
+    start_date,
+    end_date,
+    vars_4d,
+    vars_3d,
+    heights,
+    directory,
+    tile_size=0.5,
+    days_per_chunk=31,
+    **kwargs,
+):
+    """
+    Runs a timeseries area query split into tiles and monthly chunks, see ``run_tiled``.
+    """
+    tiles = plan_tiles(
+        min_longitude,
+        max_longitude,
+        min_latitude,
+        max_latitude,
+        start_date,
+        end_date,
+        tile_size,
+        days_per_chunk,
+    )
+    return await run_tiled(
+        client,
+        "timeseriesareaquery",
+        tiles,
+        lambda tile: timeseries_area_request(*tile, vars_4d, vars_3d, heights),
+        directory,
+        **kwargs,
+    )
+
+
+async def aggregation_query_tiled(
+    client,
+    min_longitude,
+    max_longitude,
+    min_latitude,
+    max_latitude,
+    start_date,
+    end_date,
+    aggregation,
+    directory,
+    tile_size=0.5,
+    **kwargs,
+):
+    """
+    Runs an aggregation query split into spatial tiles, see ``run_tiled``.
+
+    The date range is not split, as aggregates like the standard deviation cannot be
+    combined across chunks.
+    """
+    tiles = plan_tiles(
+        min_longitude,
+        max_longitude,
+        min_latitude,
+        max_latitude,
+        start_date,
+        end_date,
+        tile_size,
+    )
+    return await run_tiled(
+        client,
+        "aggregationquery",
+        tiles,
+        lambda tile: aggregation_request(*tile, aggregation),
+        directory,
+        **kwargs,
+    )